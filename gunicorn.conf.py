@@ -0,0 +1,79 @@
+"""
+Gunicorn settings for production (see Procfile).
+
+Every value can be overridden from the environment. Measure changes with
+``python manage.py loadtest --compare``.
+"""
+import gc
+import glob
+import multiprocessing
+import os
+
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# Rendering is CPU-bound, so one process per core (plus one to cover I/O
+# waits); threads keep a worker busy while others wait on the database,
+# the disk cache or slow clients.
+workers = int(os.environ.get('WEB_CONCURRENCY', cpus + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Load the app, the PDF renderer and its font tables once in the master;
+# forked workers share those pages copy-on-write.
+preload_app = True
+
+# Restart each worker after about this many requests to bound memory growth;
+# the jitter keeps all workers from restarting at once.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# A large resume can take a while to render; kill a worker only when it is
+# stuck well past that, and let in-flight downloads finish on restart.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Settings are read when the app is preloaded below: WAL on the database,
+# db.sqlite3 included (see SQLITE_KEEP_JOURNAL_MODE).
+os.environ.setdefault('SQLITE_WAL', 'True')
+
+
+def on_starting(server):
+    # Per-process metrics files from the previous run (resumes/metrics.py)
+    from django.conf import settings
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+        os.unlink(path)
+
+
+def child_exit(server, worker):
+    # Fold the worker's metrics file into the totals of exited workers, so
+    # each max_requests restart does not leave one more file to merge.
+    from django.conf import settings
+    from resumes.metrics import retire_process
+    retire_process(settings.METRICS_DIR, worker.pid)
+
+
+def when_ready(server):
+    from django.db import connections
+    from resumes.pdf import render_resume_pdf_bytes
+
+    # Import reportlab and fill the glyph width tables with one throwaway
+    # render, so workers start with them instead of each building its own.
+    render_resume_pdf_bytes({
+        'full_name': 'Warm Up',
+        'email': 'warm@example.com',
+        'phone': '',
+        'address': '',
+        'summary': 'Warm up.',
+        'education': [],
+        'experience': [],
+        'skills': [{'name': 'Python', 'proficiency': 'Expert'}],
+    })
+    # Workers must open their own database connections.
+    connections.close_all()
+    # Keep the garbage collector from touching (and so copying) the objects
+    # loaded so far in every worker.
+    gc.freeze()
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import sys
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'resumes.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,7 +59,8 @@ ROOT_URLCONF = 'resume_builder.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, timed for the performance metrics
+        'BACKEND': 'resumes.metrics.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -71,6 +75,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'resume_builder.wsgi.application'
 
+# Route dashboard, edit and download to the async views in resumes/async_views.py.
+# Only worth it when served over ASGI (resume_builder.asgi).
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -79,13 +87,73 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests; checked before each reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Busy timeout: wait this many seconds for the write lock
+            # instead of failing with "database is locked"
+            'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+            # Take the write lock at BEGIN, so a transaction that reads and
+            # then writes never fails to upgrade its lock
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Pragmas set on each new SQLite connection (resumes/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    # Negative values are in KiB: a 64 MiB page cache per connection
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KIB', 64 * 1024)),
+    'temp_store': 'MEMORY',
+}
+
+# Database files whose journal mode is left alone. Switching to WAL rewrites
+# the file, and db.sqlite3 is the development database checked into the
+# repository; SQLITE_WAL=True (set by gunicorn.conf.py) puts it in WAL too.
+SQLITE_KEEP_JOURNAL_MODE = [] if os.environ.get('SQLITE_WAL', 'False') == 'True' else [str(BASE_DIR / 'db.sqlite3')]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Cache: files on disk under the project by default, shared by every process
+# serving it. The session's user and the rendered page fragments are cached,
+# and both are invalidated by whichever worker handled the change, so the
+# workers must share the cache. CACHE_BACKEND=locmem (per process) is only
+# safe with a single process, e.g. runserver, and is the default for
+# `manage.py test` so the suite never touches a live instance's cache.
+TESTING = sys.argv[1:2] == ['test']
+if os.environ.get('CACHE_BACKEND', 'locmem' if TESTING else 'file') == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'resume-builder',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', os.path.join(BASE_DIR, 'cache')),
+        }
+    }
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Serve the session's user from the cache (see resumes/backends.py). Sessions
+# store the backend that logged them in, so ModelBackend stays listed for
+# the ones created before it was added.
+AUTHENTICATION_BACKENDS = [
+    'resumes.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', 300))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -123,6 +191,16 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'resumes', 'static'),
 ]
 
+# collectstatic writes hashed names plus gzip/brotli and WebP variants
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'resumes.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -131,6 +209,55 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Generated PDF cache (see resumes/pdf_cache.py)
+PDF_CACHE_DIR = os.path.join(MEDIA_ROOT, 'pdf_cache')
+PDF_CACHE_MEMORY_ITEMS = int(os.environ.get('PDF_CACHE_MEMORY_ITEMS', 128))
+PDF_CACHE_MEMORY_BYTES = int(os.environ.get('PDF_CACHE_MEMORY_BYTES', 32 * 1024 * 1024))
+PDF_CACHE_DISK_BYTES = int(os.environ.get('PDF_CACHE_DISK_BYTES', 512 * 1024 * 1024))
+
+# Stream PDFs from a spooled temp file instead of buffering them in memory.
+PDF_STREAMING = os.environ.get('PDF_STREAMING', 'True') == 'True'
+PDF_SPOOL_MAX_MEMORY = int(os.environ.get('PDF_SPOOL_MAX_MEMORY', 256 * 1024))
+
+# Processes used to render PDFs in parallel (bulk ZIP download)
+PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Queue downloads for `manage.py render_worker` instead of rendering inline
+PDF_ASYNC_RENDERING = os.environ.get('PDF_ASYNC_RENDERING', 'False') == 'True'
+PDF_WORKER_CONCURRENCY = int(os.environ.get('PDF_WORKER_CONCURRENCY', PDF_RENDER_WORKERS))
+
+# Queue a debounced pre-render whenever a resume or its sections change.
+# Renders are picked up by `manage.py render_worker`.
+PDF_PRERENDER_ON_SAVE = os.environ.get('PDF_PRERENDER_ON_SAVE', 'True') == 'True'
+PDF_PRERENDER_DELAY = float(os.environ.get('PDF_PRERENDER_DELAY', 5))
+
+# Renderer benchmarks (`manage.py benchmark_pdf`); fail when a metric is this
+# much worse than the saved baseline. The checked-in baseline only has page
+# and query counts; point PDF_BENCHMARK_BASELINE at one saved with --timings
+# on this machine to check timings too.
+PDF_BENCHMARK_BASELINE = os.environ.get('PDF_BENCHMARK_BASELINE', os.path.join(BASE_DIR, 'pdf_benchmark_baseline.json'))
+PDF_BENCHMARK_THRESHOLD = float(os.environ.get('PDF_BENCHMARK_THRESHOLD', 0.25))
+
+# Import-time budget for `resume_builder.wsgi` plus the URLconf, checked by
+# the test suite with `python -X importtime`
+STARTUP_IMPORT_BUDGET_MS = int(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1000))
+
+# Resumes per dashboard page
+DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 20))
+
+# Admin change lists over more rows than this show an estimated total
+# instead of running COUNT(*) on every page (see EstimatedCountPaginator)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000))
+
+# Per-request performance metrics (resumes/metrics.py). Each process writes
+# its histograms to METRICS_DIR, which /metrics/ merges; clear it on restart.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'True') == 'True'
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'resume_builder_metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+# Clients allowed to scrape /metrics/ besides logged-in staff
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'home'
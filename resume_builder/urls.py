@@ -19,10 +19,18 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from resumes.views import static_file
+
 urlpatterns = [
     path('admin/', admin.site.urls),
      path('', include('resumes.urls')),
 ]
 
+# Static files, served by Django with far-future cache headers for hashed
+# names (see resumes/storage.py)
+urlpatterns += [
+    path(f"{settings.STATIC_URL.lstrip('/')}<path:path>", static_file, name='static_file'),
+]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -1,9 +1,156 @@
 from django.contrib import admin
+from django.db import transaction
 
 # Register your models here.
-from .models import Resume , Education, Experience, Skill
-admin .site.register(Resume)
-admin.site.register(Education)
-admin.site.register(Experience)
-admin.site.register(Skill)
+from .models import Resume , Education, Experience, Skill, RenderJob, CanonicalSkill, normalize_skill_name
+from .pagination import EstimatedCountPaginator
+from .search import filter_resumes, uses_fts
 
+
+class BaseAdmin(admin.ModelAdmin):
+    """Change list settings that keep big tables responsive."""
+
+    paginator = EstimatedCountPaginator
+    # Filtered lists would otherwise also COUNT(*) the whole table for the
+    # "N total" link.
+    show_full_result_count = False
+    list_per_page = 50
+    # Primary key order pages through an index.
+    ordering = ('-pk',)
+
+
+class EducationInline(admin.TabularInline):
+    model = Education
+    extra = 0
+
+
+class ExperienceInline(admin.StackedInline):
+    model = Experience
+    extra = 0
+
+
+class SkillInline(admin.TabularInline):
+    model = Skill
+    extra = 0
+
+
+class ResumeAdmin(BaseAdmin):
+    list_display = ('full_name', 'email', 'user', 'updated_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    inlines = (EducationInline, ExperienceInline, SkillInline)
+    # Searched through the full-text index (resumes/search.py); listing a
+    # field here just turns the search box on.
+    search_fields = ('full_name',)
+    readonly_fields = ('snapshot_version', 'created_at', 'updated_at')
+    exclude = ('snapshot', 'section_versions')
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        # The icontains fallback joins the section tables.
+        return filter_resumes(queryset, search_term), not uses_fts()
+
+    def save_related(self, request, form, formsets, change):
+        # Runs inside the change view's transaction, after the inlines saved.
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_snapshot()
+
+
+class SectionAdmin(BaseAdmin):
+    """Keeps the parent resume's snapshot in sync with edits made in the admin."""
+
+    list_select_related = ('resume',)
+    autocomplete_fields = ('resume',)
+    # Column of the full-text index holding this section's text
+    fts_column = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        # The index narrows the search to resumes whose section matches;
+        # the entries' own columns then pick the matching entries.
+        resumes = filter_resumes(Resume.objects.all(), search_term, self.fts_column)
+        return super().get_search_results(request, queryset.filter(resume__in=resumes), search_term)
+
+    def _refresh(self, resume_ids):
+        Resume.objects.filter(id__in=resume_ids).refresh_snapshots()
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            resume_ids = {obj.resume_id}
+            if change and 'resume' in form.changed_data:
+                # Moved to another resume: the old one loses the entry.
+                resume_ids.add(form.initial['resume'])
+            self._refresh(resume_ids)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            self._refresh({obj.resume_id})
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            resume_ids = set(queryset.values_list('resume_id', flat=True))
+            super().delete_queryset(request, queryset)
+            self._refresh(resume_ids)
+
+
+class EducationAdmin(SectionAdmin):
+    list_display = ('degree', 'institution', 'resume', 'start_date')
+    search_fields = ('degree', 'institution', 'description')
+    fts_column = 'education'
+
+
+class ExperienceAdmin(SectionAdmin):
+    list_display = ('job_title', 'company', 'resume', 'start_date')
+    search_fields = ('job_title', 'company', 'description')
+    fts_column = 'experience'
+
+
+def _catalog_prefix(queryset, field, search_term):
+    """Entries whose normalized name starts with the search term, as an index range scan."""
+    key = normalize_skill_name(search_term)
+    return queryset.filter(**{f'{field}__gte': key, f'{field}__lt': key + '\U0010ffff'})
+
+
+class SkillAdmin(SectionAdmin):
+    list_display = ('name', 'proficiency', 'canonical', 'resume')
+    list_select_related = ('resume', 'canonical')
+    search_fields = ('canonical__normalized_name',)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return _catalog_prefix(queryset, 'canonical__normalized_name', search_term), False
+
+
+class CanonicalSkillAdmin(BaseAdmin):
+    list_display = ('name', 'normalized_name')
+    search_fields = ('normalized_name',)
+    readonly_fields = ('normalized_name',)
+
+    def has_add_permission(self, request):
+        # Entries are created by interning skill names (models.Skill.save).
+        return False
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return _catalog_prefix(queryset, 'normalized_name', search_term), False
+
+
+class RenderJobAdmin(BaseAdmin):
+    list_display = ('resume', 'status', 'created_at', 'finished_at')
+    list_select_related = ('resume',)
+    list_filter = ('status',)
+    autocomplete_fields = ('resume',)
+
+
+admin.site.register(Resume, ResumeAdmin)
+admin.site.register(Education, EducationAdmin)
+admin.site.register(Experience, ExperienceAdmin)
+admin.site.register(Skill, SkillAdmin)
+admin.site.register(CanonicalSkill, CanonicalSkillAdmin)
+admin.site.register(RenderJob, RenderJobAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResumesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resumes'
+
+    def ready(self):
+        from . import backends, db, metrics, signals  # noqa: F401
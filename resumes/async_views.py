@@ -0,0 +1,130 @@
+"""
+Async versions of the busiest views, used when ``ASYNC_VIEWS`` is on and the
+project is served over ASGI (e.g. ``gunicorn -k uvicorn.workers.UvicornWorker
+resume_builder.asgi``).
+
+Database access goes through Django's async ORM and PDF rendering runs in
+the bounded render process pool, so the event loop is never blocked and one
+worker can keep many slow downloads in flight.
+"""
+import asyncio
+import time
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect, render
+from django.utils.cache import patch_cache_control, add_never_cache_headers
+
+from .bulk import get_render_pool
+from .conditional import aget_resume, acondition, pdf_etag, pdf_last_modified, edit_page_etag
+from .forms import ResumeForm, EducationForm, ExperienceForm, SkillForm
+from .metrics import record_pdf_render
+from .models import Resume
+from .pagination import akeyset_page
+from .pdf import render_resume_pdf_bytes
+from .pdf_cache import content_key, get_pdf_cache
+from .render_queue import enqueue_render
+from .search import search_resumes
+
+
+# Template rendering may still touch the session or lazy user, so it runs
+# through sync_to_async like the rest of Django's sync-only code.
+arender = sync_to_async(render)
+
+
+@login_required
+async def dashboard(request):
+    user = await request.auser()
+    query = request.GET.get('q', '').strip()
+    if query:
+        # The ranked search is raw SQL on a cursor, which has no async API.
+        resumes = await sync_to_async(search_resumes)(
+            query, Resume.objects.for_dashboard(user), settings.DASHBOARD_PAGE_SIZE,
+        )
+        next_cursor = None
+    else:
+        resumes, next_cursor = await akeyset_page(
+            Resume.objects.for_dashboard(user),
+            request.GET.get('cursor', ''),
+            settings.DASHBOARD_PAGE_SIZE,
+        )
+    context = {
+        'resumes': resumes,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+        'query': query,
+    }
+    return await arender(request, 'resumes/dashboard.html', context)
+
+
+@login_required
+@acondition(etag_func=edit_page_etag)
+async def edit_resume(request, resume_id):
+    # Usually already loaded by the validators of @acondition.
+    resume = await aget_resume(request, resume_id)
+    if resume is None:
+        raise Http404('No Resume matches the given query.')
+
+    if request.method == 'POST':
+        form = ResumeForm(request.POST, instance=resume)
+        if await sync_to_async(form.is_valid)():
+            await sync_to_async(form.save)()
+            messages.success(request, 'Resume updated successfully!')
+            return redirect('edit_resume', resume_id=resume.id)
+    else:
+        form = ResumeForm(instance=resume)
+
+    context = {
+        'resume': resume,
+        'form': form,
+        'education_form': EducationForm(),
+        'experience_form': ExperienceForm(),
+        'skill_form': SkillForm(),
+    }
+    response = await arender(request, 'resumes/edit_resume.html', context)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+@acondition(etag_func=pdf_etag, last_modified_func=pdf_last_modified)
+async def download_resume(request, resume_id):
+    """
+    Serve the resume PDF, rendering it in the render pool on a cache miss.
+    The response is always streamed with FileResponse.
+    """
+    # Usually already loaded by the validators of @acondition.
+    resume = await aget_resume(request, resume_id)
+    if resume is None:
+        raise Http404('No Resume matches the given query.')
+    document = resume.to_document()
+    key = content_key(document)
+    cache = get_pdf_cache()
+
+    pdf = await sync_to_async(cache.open, thread_sensitive=False)(key)
+    if pdf is None:
+        if settings.PDF_ASYNC_RENDERING:
+            job = await sync_to_async(enqueue_render)(resume)
+            response = redirect('render_job_status', job_id=job.id)
+            add_never_cache_headers(response)
+            return response
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        data = await loop.run_in_executor(get_render_pool(), render_resume_pdf_bytes, document)
+        record_pdf_render(time.perf_counter() - start, size=len(data))
+        await sync_to_async(cache.set, thread_sensitive=False)(key, data)
+        pdf = BytesIO(data)
+
+    response = FileResponse(
+        pdf,
+        as_attachment=True,
+        filename=resume.pdf_filename(),
+        content_type='application/pdf',
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
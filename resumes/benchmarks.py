@@ -0,0 +1,290 @@
+"""
+Benchmarks for the PDF renderer behind ``download_resume`` and for resume
+search.
+
+Each scenario builds a synthetic resume, then measures loading it from the
+database and rendering it (the PDF cache is bypassed): time per resume,
+pages per second, peak Python memory and query count. Results can be saved
+as a JSON baseline and later runs compared against it. The checked-in
+baseline holds only the metrics that are the same on every machine (page
+and query counts); timings are compared against a baseline saved on the
+machine doing the comparison.
+
+Run with ``manage.py benchmark_pdf``; see ``resumes.tests`` for the
+regression check. ``manage.py benchmark_search`` times the FTS5 index
+against ``icontains`` filters over a synthetic corpus.
+"""
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from .models import Resume, Education, Experience, Skill
+from .pdf import render_resume_pdf_bytes, render_resume_pdf
+from .search import filter_resumes, icontains_filter, search_resumes
+
+
+SCENARIOS = {
+    'minimal': {'experience': 1, 'education': 1, 'skills': 5, 'summary_words': 40},
+    'experience_10': {'experience': 10, 'education': 2, 'skills': 15, 'summary_words': 60},
+    'experience_50': {'experience': 50, 'education': 3, 'skills': 20, 'summary_words': 60},
+    'long_summary': {'experience': 3, 'education': 2, 'skills': 10, 'summary_words': 2000},
+    'skills_200': {'experience': 3, 'education': 2, 'skills': 200, 'summary_words': 60},
+}
+
+# Metrics compared against the baseline, and whether lower is better
+TRACKED_METRICS = {
+    'ms_per_resume': True,
+    'peak_kib': True,
+    'queries': True,
+    'pages': True,
+    'pages_per_second': False,
+}
+
+# Metrics where any change is a regression, whatever the threshold. They do
+# not depend on the machine, so they are all a shared baseline holds.
+EXACT_METRICS = {'queries', 'pages'}
+
+_WORDS = (
+    'designed built shipped scalable services reduced latency improved '
+    'reliability mentored engineers across teams delivering customer value '
+    'with python django postgres redis kubernetes'
+).split()
+
+
+def _text(words):
+    return ' '.join(_WORDS[i % len(_WORDS)] for i in range(words))
+
+
+def build_resume(user, experience=1, education=1, skills=5, summary_words=40):
+    """Create a synthetic resume for ``user`` with the given section sizes."""
+    with transaction.atomic():
+        resume = _build_resume(user, experience, education, skills, summary_words)
+        resume.refresh_snapshot()
+    return resume
+
+
+def _build_resume(user, experience, education, skills, summary_words):
+    resume = Resume.objects.create(
+        user=user,
+        full_name='Benchmark Candidate',
+        email='candidate@example.com',
+        phone='+1 555 0100',
+        address='1 Benchmark Way, Springfield',
+        summary=_text(summary_words),
+    )
+    Experience.objects.bulk_create(
+        Experience(
+            resume=resume,
+            job_title=f'Senior Engineer {i}',
+            company=f'Company {i}',
+            start_date=date(2010 + i % 10, 1, 1),
+            end_date=None if i == 0 else date(2011 + i % 10, 6, 1),
+            description='\n'.join(f'- {_text(30)}' for _ in range(4)),
+        )
+        for i in range(experience)
+    )
+    Education.objects.bulk_create(
+        Education(
+            resume=resume,
+            degree=f'Degree {i}',
+            institution=f'University {i}',
+            start_date=date(2000 + i, 9, 1),
+            end_date=date(2004 + i, 6, 1),
+            description=_text(20),
+        )
+        for i in range(education)
+    )
+    proficiencies = ['Expert', 'Advanced', 'Intermediate', 'Beginner']
+    Skill.objects.bulk_create(
+        Skill(resume=resume, name=f'Skill {i}', proficiency=proficiencies[i % 4])
+        for i in range(skills)
+    )
+    return resume
+
+
+def load_document(resume_id):
+    """Load a resume the way ``download_resume`` does and return its document."""
+    return Resume.objects.get(id=resume_id).to_document()
+
+
+def measure(resume_id, iterations=5):
+    """Benchmark loading and rendering one resume ``iterations`` times."""
+    with CaptureQueriesContext(connection) as queries:
+        load_document(resume_id)
+    query_count = len(queries)
+
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pages = render_resume_pdf(load_document(resume_id), _NullWriter())
+    elapsed = time.perf_counter() - start
+
+    # Measured separately because tracing slows rendering down a lot.
+    tracemalloc.start()
+    try:
+        render_resume_pdf_bytes(load_document(resume_id))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ms_per_resume = elapsed * 1000 / iterations
+    return {
+        'ms_per_resume': round(ms_per_resume, 3),
+        'pages': pages,
+        'pages_per_second': round(pages * iterations / elapsed, 2),
+        'peak_kib': round(peak / 1024, 1),
+        'queries': query_count,
+    }
+
+
+def run(user, scenarios=None, iterations=5):
+    """Run ``scenarios`` (default: all) and return ``{name: metrics}``."""
+    results = {}
+    for name in scenarios or SCENARIOS:
+        resume = build_resume(user, **SCENARIOS[name])
+        results[name] = measure(resume.id, iterations=iterations)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Return a list of human readable regressions where a metric in
+    ``results`` is more than ``threshold`` (e.g. 0.25 for 25%) worse than
+    in ``baseline``. Scenarios missing from the baseline are ignored.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, lower_is_better in TRACKED_METRICS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            allowed = 0 if metric in EXACT_METRICS else threshold
+            if lower_is_better:
+                limit = old * (1 + allowed)
+                worse = new > limit
+            else:
+                limit = old * (1 - allowed)
+                worse = new < limit
+            if worse:
+                regressions.append(f'{name}.{metric}: {new} vs baseline {old} (limit {limit:.2f})')
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, timings=True):
+    """Write ``results`` to ``path``; without ``timings``, only the exact metrics."""
+    if not timings:
+        results = {
+            name: {metric: value for metric, value in metrics.items() if metric in EXACT_METRICS}
+            for name, metrics in results.items()
+        }
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+SEARCH_QUERIES = ['python', 'kubernetes engineer', 'acme', 'machine learning', 'postgres redis', 'zzzz']
+
+_TITLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'DevOps Engineer', 'Designer', 'Analyst']
+_COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+_SKILLS = [
+    'Python', 'Django', 'PostgreSQL', 'Redis', 'Kubernetes', 'Machine Learning', 'Java', 'Go',
+    'React', 'TypeScript', 'Terraform', 'Figma', 'SQL', 'Spark', 'Rust', 'Excel',
+]
+
+
+def build_search_corpus(user, count, seed=0):
+    """Create ``count`` varied resumes for ``user``, snapshots (and so the index) included."""
+    rng = random.Random(seed)
+    with transaction.atomic():
+        resumes = Resume.objects.bulk_create(
+            Resume(
+                user=user,
+                full_name=f'Candidate {i}',
+                email=f'candidate{i}@example.com',
+                phone='+1 555 0100',
+                address='1 Benchmark Way, Springfield',
+                summary=' '.join(rng.choices(_WORDS, k=60)),
+            )
+            for i in range(count)
+        )
+        experience, education, skills = [], [], []
+        for resume in resumes:
+            for _ in range(3):
+                experience.append(Experience(
+                    resume=resume,
+                    job_title=rng.choice(_TITLES),
+                    company=rng.choice(_COMPANIES),
+                    start_date=date(2015, 1, 1),
+                    description=' '.join(rng.choices(_WORDS, k=80)),
+                ))
+            education.append(Education(
+                resume=resume,
+                degree='BSc Computer Science',
+                institution='University of Springfield',
+                start_date=date(2008, 9, 1),
+                end_date=date(2012, 6, 1),
+                description=' '.join(rng.choices(_WORDS, k=20)),
+            ))
+            for name in rng.sample(_SKILLS, 5):
+                skills.append(Skill(resume=resume, name=name, proficiency='Advanced'))
+        Experience.objects.bulk_create(experience)
+        Education.objects.bulk_create(education)
+        Skill.objects.bulk_create(skills)
+
+        resumes = list(Resume.objects.filter(user=user).with_sections())
+        for resume in resumes:
+            resume.set_snapshot(resume.build_snapshot(), resume.snapshot_version + 1)
+        Resume.objects.bulk_update(resumes, ['snapshot', 'snapshot_version', 'section_versions', 'updated_at'])
+
+
+def _time(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def measure_search(user, queries=SEARCH_QUERIES, iterations=5):
+    """
+    Median milliseconds per query for the FTS5 filter, the ranked FTS5
+    search (top 20 with snippets) and the ``icontains`` baseline, over
+    ``user``'s resumes.
+    """
+    queryset = Resume.objects.filter(user=user)
+    results = {}
+    for query in queries:
+        fts_ms, fts_ids = _time(lambda: list(filter_resumes(queryset, query).values_list('id', flat=True)), iterations)
+        ranked_ms, _ = _time(lambda: search_resumes(query, queryset), iterations)
+        like_ms, like_ids = _time(lambda: list(icontains_filter(queryset, query).values_list('id', flat=True)), iterations)
+        results[query] = {
+            'fts_ms': round(fts_ms, 3),
+            'ranked_ms': round(ranked_ms, 3),
+            'icontains_ms': round(like_ms, 3),
+            'fts_matches': len(fts_ids),
+            'icontains_matches': len(like_ids),
+            'speedup': round(like_ms / fts_ms, 1) if fts_ms else None,
+        }
+    return results
+
+
+class _NullWriter:
+    """Discards the PDF so timings do not include copying the bytes around."""
+
+    def write(self, data):
+        return len(data)
@@ -0,0 +1,129 @@
+"""
+Rendering many resumes at once.
+
+PDFs are rendered in a bounded process pool so the work spreads across CPU
+cores, and finished PDFs are written into a ZIP archive that is streamed to
+the client as each render completes.
+"""
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .pdf import render_resume_pdf_bytes
+from .pdf_cache import content_key, get_pdf_cache
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_render_pool():
+    """
+    Return this process's render pool, creating it on first use. The pool is
+    never shared across a fork (e.g. gunicorn workers forked from a preloaded
+    master), because a forked pool cannot talk to its parent's children.
+
+    Workers are started by a forkserver rather than forked from this process:
+    a fork of a threaded web worker can inherit locks held by other threads
+    (and their open database connections), and the renderer only needs
+    ``resumes.pdf``, not the state of the process asking for the PDF.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('forkserver'),
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def render_many(documents, store=True):
+    """
+    Yield ``(index, pdf_bytes)`` for each document in ``documents`` in
+    completion order. Cached PDFs come first; the rest are rendered in the
+    render pool and added to the cache. With ``store=False`` the cache is
+    only read, and reads do not count as use, so a bulk job (e.g. a nightly
+    export) does not push out the PDFs users are downloading.
+    """
+    cache = get_pdf_cache()
+    pending = {}
+    for index, document in enumerate(documents):
+        key = content_key(document)
+        data = cache.get(key, touch=store)
+        if data is not None:
+            yield index, data
+        else:
+            pending[index] = (key, document)
+
+    if not pending:
+        return
+
+    pool = get_render_pool()
+    futures = {
+        pool.submit(render_resume_pdf_bytes, document): (index, key)
+        for index, (key, document) in pending.items()
+    }
+    try:
+        for future in as_completed(futures):
+            index, key = futures[future]
+            data = future.result()
+            if store:
+                cache.set(key, data)
+            yield index, data
+    finally:
+        # Client went away or a render failed; drop what has not started.
+        for future in futures:
+            future.cancel()
+
+
+class _ZipChunks:
+    """Write-only file object that hands back whatever ZipFile wrote to it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(files):
+    """
+    Yield the bytes of a ZIP archive built from ``(arcname, data)`` pairs as
+    they arrive. PDFs are already compressed, so entries are stored as is.
+    """
+    out = _ZipChunks()
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for arcname, data in files:
+            archive.writestr(arcname, data)
+            yield out.drain()
+    yield out.drain()
+
+
+def unique_filenames(names):
+    """Return ``names`` with ``_2``, ``_3``... added to repeated entries."""
+    seen = {}
+    result = []
+    for name in names:
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        if count > 1:
+            stem, ext = os.path.splitext(name)
+            name = f'{stem}_{count}{ext}'
+        result.append(name)
+    return result
@@ -0,0 +1,114 @@
+"""
+Validators for conditional GETs on resume pages.
+
+``Resume.updated_at`` and ``snapshot_version`` change whenever the resume or
+any of its sections change (see ``Resume.refresh_snapshot``), so both come
+from the resume row alone: a matching ``If-None-Match`` gets its 304 after a
+single primary-key lookup, without loading sections or rendering anything.
+The view reuses the row when it does run.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from .models import Resume
+from .pdf import LAYOUT_VERSION
+
+
+def _etag(*parts):
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+
+def get_resume(request, resume_id):
+    """
+    The request user's resume ``resume_id``, or None. Loaded once per request
+    and shared by the validators below and the view itself.
+    """
+    resumes = request.__dict__.setdefault('_resumes', {})
+    if resume_id not in resumes:
+        resumes[resume_id] = Resume.objects.filter(id=resume_id, user=request.user).first()
+    return resumes[resume_id]
+
+
+async def aget_resume(request, resume_id):
+    """``get_resume`` for async views, through the async ORM."""
+    resumes = request.__dict__.setdefault('_resumes', {})
+    if resume_id not in resumes:
+        user = await request.auser()
+        resumes[resume_id] = await Resume.objects.filter(id=resume_id, user=user).afirst()
+    return resumes[resume_id]
+
+
+def _version(request, resume_id):
+    resume = get_resume(request, resume_id)
+    if resume is None:
+        return None
+    return resume.updated_at, resume.snapshot_version
+
+
+def pdf_etag(request, resume_id):
+    version = _version(request, resume_id)
+    if version is None:
+        return None
+    return _etag('pdf', resume_id, version[0].isoformat(), version[1], LAYOUT_VERSION)
+
+
+def pdf_last_modified(request, resume_id):
+    version = _version(request, resume_id)
+    return version[0] if version else None
+
+
+def edit_page_etag(request, resume_id):
+    """
+    ETag for the edit page. Besides the resume version it covers the CSRF
+    secret (rotated on login), so a cached page never carries a stale form
+    token. Pages that show flash messages get no ETag, so they are never
+    revalidated.
+    """
+    if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+        return None
+    version = _version(request, resume_id)
+    if version is None:
+        return None
+    return _etag(
+        'edit', request.META.get('CSRF_COOKIE', ''),
+        resume_id, version[0].isoformat(), version[1],
+    )
+
+
+def _validators(etag_func, last_modified_func, request, *args, **kwargs):
+    etag = etag_func(request, *args, **kwargs) if etag_func else None
+    last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+    return (
+        quote_etag(etag) if etag is not None else None,
+        int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    ``django.views.decorators.http.condition`` for async views. The
+    validator functions above query the database and the session, so they
+    run in a thread rather than on the event loop.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(_validators)(
+                etag_func, last_modified_func, request, *args, **kwargs
+            )
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
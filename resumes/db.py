@@ -0,0 +1,31 @@
+"""
+SQLite tuning applied to every new database connection.
+
+WAL lets readers and a writer work at the same time: readers keep reading
+their snapshot while a write commits, and a write only waits for other
+writes. ``synchronous=NORMAL`` is safe in WAL mode (a power loss can drop the
+last commits, never corrupt the file) and saves an fsync per commit.
+
+The journal mode is not changed on the files in
+``SQLITE_KEEP_JOURNAL_MODE`` (by default the checked-in development
+database), since that rewrites the file.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = settings.SQLITE_PRAGMAS
+    if str(connection.settings_dict['NAME']) in settings.SQLITE_KEEP_JOURNAL_MODE:
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
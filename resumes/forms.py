@@ -117,4 +117,18 @@ class SkillForm(forms.ModelForm):
         labels = {
             'name': 'Skill Name',
             'proficiency': 'Proficiency Level',
-        }
\ No newline at end of file
+        }
+
+
+# Batch entry: many new rows per section in one POST (see views.batch_add)
+BATCH_MAX_ENTRIES = 200
+
+EducationFormSet = forms.formset_factory(
+    EducationForm, extra=3, max_num=BATCH_MAX_ENTRIES, absolute_max=BATCH_MAX_ENTRIES, validate_max=True
+)
+ExperienceFormSet = forms.formset_factory(
+    ExperienceForm, extra=3, max_num=BATCH_MAX_ENTRIES, absolute_max=BATCH_MAX_ENTRIES, validate_max=True
+)
+SkillFormSet = forms.formset_factory(
+    SkillForm, extra=10, max_num=BATCH_MAX_ENTRIES, absolute_max=BATCH_MAX_ENTRIES, validate_max=True
+)
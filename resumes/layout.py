@@ -0,0 +1,77 @@
+"""
+Text layout helpers for the PDF renderer.
+
+Line breaking works on per-word widths summed from a per-font glyph width
+table, so wrapping a paragraph is a single linear pass instead of measuring
+the growing line again for every word.
+"""
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+
+
+class FontMetrics:
+    """Glyph widths for one font at one size."""
+
+    def __init__(self, font_name, font_size):
+        self.font_name = font_name
+        self.font_size = font_size
+        self._table = _glyph_widths(font_name)
+        self._scale = font_size * 0.001
+
+    def _units(self, text):
+        table = self._table
+        units = 0
+        for ch in text:
+            width = table.get(ch)
+            if width is None:
+                # Outside the precomputed range; measure once and remember it.
+                width = table[ch] = pdfmetrics.stringWidth(ch, self.font_name, 1000)
+            units += width
+        return units
+
+    def width(self, text):
+        """Width of ``text`` in points, identical to ``canvas.stringWidth``."""
+        return self._units(text) * self._scale
+
+    def wrap_words(self, words, max_width, separator=' '):
+        """
+        Greedily pack ``words`` into lines no wider than ``max_width`` points,
+        joining words on the same line with ``separator``. A word that is wider
+        than ``max_width`` on its own gets a line to itself.
+        """
+        limit = max_width / self._scale
+        sep_units = self._units(separator)
+        lines = []
+        current = []
+        current_units = 0
+        for word in words:
+            word_units = self._units(word)
+            if current and current_units + sep_units + word_units > limit:
+                lines.append(separator.join(current))
+                current = []
+            if current:
+                current_units += sep_units + word_units
+            else:
+                current_units = word_units
+            current.append(word)
+        if current:
+            lines.append(separator.join(current))
+        return lines
+
+    def wrap_text(self, text, max_width):
+        """Wrap whitespace-separated ``text`` to ``max_width`` points."""
+        return self.wrap_words(text.split(), max_width)
+
+
+@lru_cache(maxsize=None)
+def _glyph_widths(font_name):
+    # Widths in 1/1000 em for the Latin-1 range; other characters are added
+    # on first use by FontMetrics._units.
+    return {chr(code): pdfmetrics.stringWidth(chr(code), font_name, 1000) for code in range(32, 256)}
+
+
+@lru_cache(maxsize=64)
+def get_metrics(font_name, font_size):
+    """Return the shared FontMetrics for ``font_name`` at ``font_size``."""
+    return FontMetrics(font_name, font_size)
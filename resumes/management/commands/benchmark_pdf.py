@@ -0,0 +1,68 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from resumes import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PDF rendering on synthetic resumes and compare with a saved baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*',
+            help=f"Scenarios to run (default: all of {', '.join(benchmarks.SCENARIOS)}).",
+        )
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--baseline', default=settings.PDF_BENCHMARK_BASELINE)
+        parser.add_argument('--threshold', type=float, default=settings.PDF_BENCHMARK_THRESHOLD)
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Write the results to the baseline file instead of comparing.',
+        )
+        parser.add_argument(
+            '--timings', action='store_true',
+            help='Save timing and memory metrics in the baseline too. Only meaningful for a '
+                 'baseline kept on the machine that compares against it (PDF_BENCHMARK_BASELINE).',
+        )
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['scenarios']) - set(benchmarks.SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        # Synthetic rows never outlive the run.
+        with transaction.atomic():
+            user = User.objects.create_user('pdf-benchmark')
+            results = benchmarks.run(user, options['scenarios'], options['iterations'])
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+        else:
+            self.stdout.write(f"{'scenario':<16}{'ms/resume':>12}{'pages':>8}{'pages/s':>10}{'peak KiB':>11}{'queries':>9}")
+            for name, m in results.items():
+                self.stdout.write(
+                    f"{name:<16}{m['ms_per_resume']:>12.1f}{m['pages']:>8}"
+                    f"{m['pages_per_second']:>10.1f}{m['peak_kib']:>11.1f}{m['queries']:>9}"
+                )
+
+        if options['save_baseline']:
+            benchmarks.save_baseline(options['baseline'], results, timings=options['timings'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        try:
+            baseline = benchmarks.load_baseline(options['baseline'])
+        except FileNotFoundError:
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline first.")
+            return
+
+        regressions = benchmarks.compare(results, baseline, options['threshold'])
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
@@ -0,0 +1,39 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from resumes import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark full-text resume search (FTS5) against icontains filters on a synthetic corpus.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*', help='Queries to run (default: a built-in set).')
+        parser.add_argument('--resumes', type=int, default=2000, help='Size of the synthetic corpus.')
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        # Synthetic rows never outlive the run.
+        with transaction.atomic():
+            user = User.objects.create_user('search-benchmark')
+            benchmarks.build_search_corpus(user, options['resumes'])
+            results = benchmarks.measure_search(
+                user, options['queries'] or benchmarks.SEARCH_QUERIES, options['iterations'],
+            )
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+            return
+        self.stdout.write(
+            f"{'query':<22}{'fts ms':>9}{'ranked ms':>11}{'icontains ms':>14}{'speedup':>9}{'matches':>14}"
+        )
+        for query, m in results.items():
+            self.stdout.write(
+                f"{query:<22}{m['fts_ms']:>9.2f}{m['ranked_ms']:>11.2f}{m['icontains_ms']:>14.2f}"
+                f"{m['speedup'] or 0:>8.1f}x{m['fts_matches']:>7}/{m['icontains_matches']}"
+            )
@@ -0,0 +1,174 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.bulk import render_many
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = (
+        'Export every resume as NDJSON (the shape import_resumes reads), optionally with its PDF. '
+        'PDFs come from the download renderer and its cache (which is left as it is), rendered in the render pool '
+        '(PDF_RENDER_WORKERS processes), into a sharded directory or a tar file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-',
+            help="NDJSON file to write ('-' for stdout); compressed if it ends in .gz.",
+        )
+        parser.add_argument('--user', help='Only export resumes of this user.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Resumes read and rendered at a time.')
+        pdfs = parser.add_mutually_exclusive_group()
+        pdfs.add_argument('--pdf-dir', help='Write PDFs to <dir>/<shard>/<id>.pdf.')
+        pdfs.add_argument('--pdf-tar', help='Write PDFs into this tar file, laid out as with --pdf-dir.')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.select_related('user').defer('section_versions').order_by('id')
+        if options['user']:
+            resumes = resumes.filter(user__username=options['user'])
+
+        started = time.perf_counter()
+        stats = {'resumes': 0, 'pdfs': 0, 'json_bytes': 0, 'pdf_bytes': 0}
+        with open_output(options['output'], self.stdout) as out, open_pdf_sink(options) as pdf_sink:
+            chunk = []
+            for resume in resumes.iterator(chunk_size=options['chunk_size']):
+                record = export_record(resume)
+                if pdf_sink is not None:
+                    record['pdf'] = pdf_path(resume.id)
+                line = json.dumps(record, ensure_ascii=False) + '\n'
+                out.write(line)
+                stats['resumes'] += 1
+                stats['json_bytes'] += len(line.encode('utf-8'))
+                if pdf_sink is not None:
+                    chunk.append(resume)
+                    if len(chunk) >= options['chunk_size']:
+                        self._export_pdfs(chunk, pdf_sink, stats)
+                        chunk = []
+            if chunk:
+                self._export_pdfs(chunk, pdf_sink, stats)
+
+        elapsed = time.perf_counter() - started
+        report = (
+            f"Exported {stats['resumes']} resumes ({stats['json_bytes'] / 1e6:.1f} MB of NDJSON) "
+            f"in {elapsed:.1f}s, {stats['resumes'] / elapsed if elapsed else 0:.0f} resumes/s"
+        )
+        if pdf_sink is not None:
+            report += (
+                f"; {stats['pdfs']} PDFs ({stats['pdf_bytes'] / 1e6:.1f} MB), "
+                f"{stats['pdfs'] / elapsed if elapsed else 0:.1f} PDFs/s"
+            )
+        # stdout may be carrying the export itself.
+        self.stderr.write(self.style.SUCCESS(report))
+
+    def _export_pdfs(self, resumes, sink, stats):
+        # Reads the PDF cache but leaves it alone: an export touches every
+        # resume, and would otherwise evict the ones being downloaded.
+        for index, data in render_many([resume.to_document() for resume in resumes], store=False):
+            resume = resumes[index]
+            sink.write(pdf_path(resume.id), data, resume.updated_at.timestamp())
+            stats['pdfs'] += 1
+            stats['pdf_bytes'] += len(data)
+        self.stderr.write(f"{stats['resumes']} resumes, {stats['pdfs']} PDFs")
+
+
+def export_record(resume):
+    return {
+        'id': resume.id,
+        'user': resume.user.username,
+        'created_at': resume.created_at.isoformat(),
+        'updated_at': resume.updated_at.isoformat(),
+        **resume.to_document(),
+    }
+
+
+def pdf_path(resume_id):
+    """Spread PDFs over 256 directories so none grows too large."""
+    return f'{resume_id % 256:02x}/{resume_id}.pdf'
+
+
+class open_output:
+    """
+    The NDJSON output file. It is written under a temporary name and only
+    renamed into place once the export finished, so a failed nightly run
+    never leaves a truncated export behind.
+    """
+
+    def __init__(self, path, stdout):
+        self.path = path
+        self.stdout = stdout
+
+    def __enter__(self):
+        if self.path == '-':
+            return self.stdout
+        self.tmp = f'{self.path}.tmp'
+        try:
+            if self.path.endswith('.gz'):
+                self.file = gzip.open(self.tmp, 'wt', encoding='utf-8')
+            else:
+                self.file = open(self.tmp, 'w', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot write {self.path}: {e}')
+        return self.file
+
+    def __exit__(self, exc_type, *exc):
+        if self.path == '-':
+            return
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp, self.path)
+        else:
+            os.unlink(self.tmp)
+
+
+class DirectorySink:
+    def __init__(self, root):
+        self.root = root
+
+    def write(self, name, data, mtime):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (mtime, mtime))
+
+    def close(self):
+        pass
+
+
+class TarSink:
+    def __init__(self, path):
+        # PDFs are compressed already, so the tar is not.
+        self.tar = tarfile.open(path, 'w')
+
+    def write(self, name, data, mtime):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = mtime
+        self.tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.tar.close()
+
+
+class open_pdf_sink:
+    def __init__(self, options):
+        self.options = options
+        self.sink = None
+
+    def __enter__(self):
+        if self.options['pdf_dir']:
+            self.sink = DirectorySink(self.options['pdf_dir'])
+        elif self.options['pdf_tar']:
+            self.sink = TarSink(self.options['pdf_tar'])
+        return self.sink
+
+    def __exit__(self, *exc):
+        if self.sink is not None:
+            self.sink.close()
@@ -0,0 +1,356 @@
+import json
+import os
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from resumes.forms import ResumeForm, EducationForm, ExperienceForm, SkillForm
+from resumes.models import Resume, Education, Experience, Skill
+
+
+SECTIONS = (
+    ('education', EducationForm, Education),
+    ('experience', ExperienceForm, Experience),
+    ('skills', SkillForm, Skill),
+)
+
+# Fields the site's forms require but that JSON Resume (where everything is
+# optional) often leaves out; imports store them empty rather than reject
+# the document.
+OPTIONAL_FIELDS = {
+    ResumeForm: ('phone', 'address'),
+    EducationForm: ('degree', 'institution'),
+    ExperienceForm: ('job_title', 'company', 'description'),
+}
+
+PROFICIENCY_LEVELS = {
+    'beginner': 'Beginner', 'novice': 'Beginner', 'basic': 'Beginner', 'elementary': 'Beginner',
+    'intermediate': 'Intermediate',
+    'advanced': 'Advanced',
+    'expert': 'Expert', 'master': 'Expert', 'fluent': 'Expert', 'native': 'Expert',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Import resumes from an NDJSON file (one document per line) or a JSON file holding one '
+        'document or an array of them. Documents are JSON Resume (https://jsonresume.org) or the '
+        'shape export_resumes writes. Invalid documents are reported and skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for NDJSON on stdin.")
+        parser.add_argument('--user', required=True, help='Owner of the imported resumes.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Resumes per transaction.')
+        parser.add_argument(
+            '--checkpoint',
+            help='Record progress in this file after every batch; if it exists, continue after '
+                 'the last batch it records. Removed once the import completes.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['user']!r}")
+
+        path = options['path']
+        checkpoint = options['checkpoint']
+        state = {'source': os.path.abspath(path) if path != '-' else '-', 'records': 0, 'imported': 0, 'skipped': 0}
+        if checkpoint and os.path.exists(checkpoint):
+            state = read_checkpoint(checkpoint, state['source'])
+            self.stdout.write(f"Continuing after record {state['records']} from {checkpoint}")
+        done = state['records']
+
+        rows = 0
+        started = time.perf_counter()
+        batch = []
+
+        def flush():
+            nonlocal rows, batch
+            if batch:
+                rows += save_batch(user, batch)
+                state['imported'] += len(batch)
+                batch = []
+            if checkpoint:
+                # Written after the commit: a crash in between means the
+                # next run repeats this one batch.
+                write_checkpoint(checkpoint, state)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{state['records']} records, {state['imported']} imported, {state['skipped']} skipped, "
+                f"{rows / elapsed if elapsed else 0:.0f} rows/s"
+            )
+
+        with open_input(path) as stream:
+            for number, document in iter_documents(stream, path):
+                if number <= done:
+                    continue
+                state['records'] = number
+                try:
+                    batch.append(build_resume(document))
+                except ValueError as e:
+                    state['skipped'] += 1
+                    self.stderr.write(f'Record {number}: {e}')
+                if len(batch) >= options['batch_size']:
+                    flush()
+        flush()
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.unlink(checkpoint)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {state['imported']} resumes ({rows} rows) in {elapsed:.1f}s, "
+            f"{rows / elapsed if elapsed else 0:.0f} rows/s; skipped {state['skipped']}"
+        ))
+
+
+def open_input(path):
+    if path == '-':
+        return open(sys.stdin.fileno(), encoding='utf-8', closefd=False)
+    try:
+        return open(path, encoding='utf-8')
+    except OSError as e:
+        raise CommandError(f'Cannot read {path}: {e}')
+
+
+def iter_documents(stream, path):
+    """
+    Yield ``(record number, document)`` pairs, reading ``stream`` as NDJSON
+    unless ``path`` ends in ``.json``. Unparseable NDJSON lines yield a
+    ``ValueError`` in place of the document.
+    """
+    if path.endswith('.json'):
+        yield from enumerate(iter_json_array(stream), start=1)
+        return
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f'invalid JSON: {e}')
+
+
+def iter_json_array(stream, chunk_size=1 << 16, max_element_size=None):
+    """
+    Yield the elements of the JSON array in ``stream`` (or the one object it
+    holds) one at a time, keeping only the element being parsed in memory.
+    An element longer than ``max_element_size`` characters (256 chunks by
+    default) or one that is invalid stops the import right there, rather
+    than after the rest of the file has been read into the buffer.
+    """
+    if max_element_size is None:
+        max_element_size = 256 * chunk_size
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    if buffer.startswith('{'):
+        yield json.loads(buffer + stream.read())
+        return
+    if not buffer.startswith('['):
+        raise CommandError('Expected a JSON object or array')
+
+    # Characters of the stream before the buffer, for error messages
+    offset = 0
+    position = 1
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            if position == len(buffer):
+                raise json.JSONDecodeError('Expecting value', buffer, position)
+            element, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # An error near the end of the buffer (or a string running past
+            # it) may just be an element cut off by the chunk boundary.
+            cut_off = e.pos > len(buffer) - 16 or e.msg.startswith('Unterminated string')
+            if eof or not cut_off:
+                raise CommandError(f'Invalid JSON array element at character {offset + e.pos}: {e.msg}')
+            if len(buffer) - position > max_element_size:
+                raise CommandError(
+                    f'JSON array element at character {offset + position} is longer than '
+                    f'{max_element_size} characters'
+                )
+        else:
+            # Unless it ends the buffer: a number may go on in the next chunk.
+            if end < len(buffer) or eof:
+                yield element
+                offset += end
+                buffer = buffer[end:]
+                position = 0
+                continue
+        more = stream.read(chunk_size)
+        eof = not more
+        offset += position
+        buffer = buffer[position:] + more
+        position = 0
+
+
+def _date(value):
+    """ISO date for a JSON Resume date, which may be just a year or year-month."""
+    if not value:
+        return ''
+    parts = str(value).split('-')
+    parts += ['01'] * (3 - len(parts))
+    return '-'.join(parts[:3])
+
+
+def _lines(*items):
+    return '\n'.join(item for item in items if item)
+
+
+def _dated(entries):
+    """JSON Resume entries with a date to start from; the site needs one."""
+    return [entry for entry in entries or [] if entry.get('startDate') or entry.get('endDate')]
+
+
+def from_json_resume(document):
+    """
+    Map a JSON Resume document onto the shape of ``Resume.to_document()``.
+    An education or work entry without a ``startDate`` starts at its
+    ``endDate``; one with neither date is left out.
+    """
+    basics = document.get('basics') or {}
+    location = basics.get('location') or {}
+    return {
+        'full_name': basics.get('name', ''),
+        'email': basics.get('email', ''),
+        'phone': basics.get('phone', ''),
+        'address': ', '.join(
+            str(location[key]) for key in ('address', 'city', 'region', 'postalCode', 'countryCode')
+            if location.get(key)
+        ),
+        'summary': basics.get('summary', ''),
+        'education': [
+            {
+                'degree': ' '.join(part for part in (entry.get('studyType'), entry.get('area')) if part),
+                'institution': entry.get('institution', ''),
+                'start_date': _date(entry.get('startDate') or entry.get('endDate')),
+                'end_date': _date(entry.get('endDate')),
+                'description': _lines(
+                    f"Score: {entry['score']}" if entry.get('score') else '',
+                    *map(str, entry.get('courses') or []),
+                ),
+            }
+            for entry in _dated(document.get('education'))
+        ],
+        'experience': [
+            {
+                'job_title': entry.get('position', ''),
+                'company': entry.get('name') or entry.get('company', ''),
+                'start_date': _date(entry.get('startDate') or entry.get('endDate')),
+                'end_date': _date(entry.get('endDate')),
+                'description': _lines(entry.get('summary'), *(f'- {h}' for h in entry.get('highlights') or [])),
+            }
+            for entry in _dated(document.get('work'))
+        ],
+        'skills': [
+            {
+                'name': entry.get('name', ''),
+                'proficiency': PROFICIENCY_LEVELS.get(str(entry.get('level', '')).strip().lower(), 'Intermediate'),
+            }
+            for entry in document.get('skills') or []
+        ],
+    }
+
+
+def _errors(form):
+    return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in form.errors.items())
+
+
+def _validate(form_class, entry):
+    """Unsaved instance for ``entry``; raises ValueError if it is invalid."""
+    form = form_class({field: entry.get(field) or '' for field in form_class._meta.fields})
+    for field in OPTIONAL_FIELDS.get(form_class, ()):
+        form.fields[field].required = False
+    if not form.is_valid():
+        raise ValueError(_errors(form))
+    return form.save(commit=False)
+
+
+def build_resume(document):
+    """
+    Validate ``document`` with the forms the site uses, less the
+    ``OPTIONAL_FIELDS``, and return unsaved ``(resume, {section: [rows]})``;
+    raises ValueError if anything is invalid.
+    """
+    if isinstance(document, Exception):
+        raise document
+    if not isinstance(document, dict):
+        raise ValueError('expected a JSON object')
+    if 'basics' in document:
+        try:
+            document = from_json_resume(document)
+        except (AttributeError, TypeError):
+            raise ValueError('not a valid JSON Resume document')
+
+    resume = _validate(ResumeForm, document)
+
+    sections = {}
+    for name, form_class, _ in SECTIONS:
+        sections[name] = []
+        for index, entry in enumerate(document.get(name) or []):
+            if not isinstance(entry, dict):
+                raise ValueError(f'{name}[{index}]: expected a JSON object')
+            try:
+                sections[name].append(_validate(form_class, entry))
+            except ValueError as e:
+                raise ValueError(f'{name}[{index}]: {e}')
+    return resume, sections
+
+
+def save_batch(user, batch):
+    """
+    Insert a batch of built resumes with one bulk_create per table, and
+    their snapshots with one bulk_update, in a single transaction. Returns
+    the number of rows written. Skills are linked to the catalog by
+    Skill.objects.bulk_create, and the search index is updated by its
+    triggers. No pre-renders are scheduled for imported resumes.
+    """
+    with transaction.atomic():
+        resumes = [resume for resume, _ in batch]
+        for resume in resumes:
+            resume.user = user
+        Resume.objects.bulk_create(resumes)
+
+        rows = len(resumes)
+        for name, _, model in SECTIONS:
+            entries = []
+            for resume, sections in batch:
+                for entry in sections[name]:
+                    entry.resume = resume
+                    entries.append(entry)
+            model.objects.bulk_create(entries)
+            rows += len(entries)
+
+        for resume, sections in batch:
+            resume.set_snapshot(
+                {name: [{'id': row.id, **row.to_document()} for row in sections[name]] for name, _, _ in SECTIONS},
+                1,
+            )
+        Resume.objects.bulk_update(resumes, ['snapshot', 'snapshot_version', 'section_versions', 'updated_at'])
+    return rows
+
+
+def read_checkpoint(path, source):
+    with open(path) as f:
+        state = json.load(f)
+    if state.get('source') != source:
+        raise CommandError(f"{path} is a checkpoint for {state.get('source')}, not {source}")
+    return state
+
+
+def write_checkpoint(path, state):
+    # Replace the file atomically so a crash never leaves half a checkpoint.
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
@@ -0,0 +1,174 @@
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Send concurrent GET requests to a running server and report throughput and latency. '
+        'With --compare, start gunicorn with its defaults and with gunicorn.conf.py and load both.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server to load (ignored with --compare).')
+        parser.add_argument('--path', default='/', help='Path to request, e.g. /download/1/.')
+        parser.add_argument('--user', help='Send requests logged in as this user.')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run each test for.')
+        parser.add_argument('--compare', action='store_true')
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['user']:
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={self._login(options['user'])}"
+
+        if not options['compare']:
+            result = run_load(options['url'], options['path'], headers, options['concurrency'], options['duration'])
+            self.stdout.write(format_result('server', result))
+            return
+
+        results = {}
+        for label, config in (('gunicorn defaults', None), ('gunicorn.conf.py', 'gunicorn.conf.py')):
+            with gunicorn_server(config) as url:
+                results[label] = run_load(url, options['path'], headers, options['concurrency'], options['duration'])
+            self.stdout.write(format_result(label, results[label]))
+        baseline, tuned = results.values()
+        if baseline['rps']:
+            self.stdout.write(self.style.SUCCESS(f"Throughput gain: {tuned['rps'] / baseline['rps']:.2f}x"))
+
+    def _login(self, username):
+        """Create a session for ``username`` and return its key."""
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f'No user named {username!r}')
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
+
+
+def run_load(url, path, headers, concurrency, duration):
+    """Keep ``concurrency`` clients requesting ``path`` for ``duration`` seconds."""
+    parts = urlsplit(url)
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        mine, failed = [], 0
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                for attempt in range(2):
+                    try:
+                        conn.request('GET', path, headers=headers)
+                        response = conn.getresponse()
+                        response.read()
+                        ok = response.status < 300 or response.status == 304
+                        break
+                    except (OSError, http.client.HTTPException):
+                        # Retry once on a fresh connection, as browsers do when
+                        # a kept-alive connection was closed by a restarting worker.
+                        conn.close()
+                        ok = False
+                if ok:
+                    mine.append(time.perf_counter() - start)
+                else:
+                    failed += 1
+        finally:
+            conn.close()
+            with lock:
+                latencies.extend(mine)
+                errors.append(failed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'seconds': round(elapsed, 2),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(0.50), 1),
+        'p95_ms': round(percentile(0.95), 1),
+        'p99_ms': round(percentile(0.99), 1),
+    }
+
+
+def format_result(label, result):
+    return (
+        f"{label}: {result['requests']} requests in {result['seconds']}s, {result['rps']} req/s, "
+        f"{result['errors']} errors, latency p50 {result['p50_ms']} ms, "
+        f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms"
+    )
+
+
+class gunicorn_server:
+    """Run gunicorn on a free local port for the duration of a ``with`` block."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def __enter__(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        self._empty_config = None
+        config = self.config
+        if config is None:
+            # Without --config gunicorn would pick up ./gunicorn.conf.py.
+            fd, config = tempfile.mkstemp(suffix='.py')
+            os.close(fd)
+            self._empty_config = config
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--config', config, '--bind', f'127.0.0.1:{port}', 'resume_builder.wsgi'],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f'http://127.0.0.1:{port}'
+        for _ in range(100):
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=1):
+                    return url
+            except OSError:
+                if self.process.poll() is not None:
+                    break
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise CommandError(f'gunicorn ({self.config or "defaults"}) did not start')
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+        if self._empty_config:
+            os.unlink(self._empty_config)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from resumes import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the resumes table.'
+
+    def handle(self, *args, **options):
+        if not search.uses_fts():
+            raise CommandError('The search index is only used on SQLite.')
+        with transaction.atomic():
+            count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} resumes'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the section snapshots on resumes, or verify that they match the section rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only report resumes whose snapshot is out of date; exit non-zero if any are.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = stale = 0
+        batch = []
+
+        resumes = Resume.objects.with_sections().order_by('id').iterator(chunk_size=batch_size)
+        for resume in resumes:
+            checked += 1
+            snapshot = resume.build_snapshot()
+            if snapshot == resume.snapshot:
+                continue
+            stale += 1
+            if options['verify']:
+                self.stdout.write(f'Resume {resume.id} has an out of date snapshot')
+                continue
+            batch.append(resume.id)
+            if len(batch) >= batch_size:
+                self._save(batch)
+                batch = []
+        if batch:
+            self._save(batch)
+
+        if options['verify']:
+            if stale:
+                raise CommandError(f'{stale} of {checked} resume snapshots are out of date')
+            self.stdout.write(self.style.SUCCESS(f'All {checked} resume snapshots are up to date'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {stale} of {checked} resume snapshots'))
+
+    def _save(self, resume_ids):
+        # Rebuilt again under the row lock: an edit committed since the scan
+        # must not be overwritten with what the scan read.
+        Resume.objects.filter(id__in=resume_ids).with_sections().refresh_snapshots()
@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from resumes.pdf import render_resume_pdf_bytes
+from resumes.render_queue import (
+    claim_jobs, fail_job, finish_job, load_document, prune_jobs, requeue_stale_jobs,
+)
+
+
+# Seconds between deletions of old finished jobs
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Process the queue of resume PDF render jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.PDF_WORKER_CONCURRENCY,
+            help='Number of PDFs rendered in parallel.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait between queue polls when idle.',
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Requeue running jobs that started more than this many seconds ago.',
+        )
+        parser.add_argument(
+            '--prune-after', type=int, default=7 * 24 * 3600,
+            help='Delete done and failed jobs that finished more than this many seconds ago '
+                 '(0 keeps them).',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling forever.',
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        self.stdout.write(f'Render worker started with concurrency {concurrency}')
+
+        with ProcessPoolExecutor(max_workers=concurrency) as pool:
+            in_flight = {}
+            last_pruned = None
+            while True:
+                requeue_stale_jobs(options['stale_after'])
+                if options['prune_after'] and (
+                    last_pruned is None or time.monotonic() - last_pruned >= PRUNE_INTERVAL
+                ):
+                    pruned = prune_jobs(options['prune_after'])
+                    if pruned:
+                        self.stdout.write(f'Deleted {pruned} finished render jobs')
+                    last_pruned = time.monotonic()
+
+                free = concurrency - len(in_flight)
+                if free > 0:
+                    for job in claim_jobs(free):
+                        try:
+                            key, document = load_document(job)
+                        except Exception as exc:
+                            fail_job(job, exc)
+                            continue
+                        future = pool.submit(render_resume_pdf_bytes, document)
+                        in_flight[future] = (job, key, time.monotonic())
+
+                if not in_flight:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, key, started = in_flight.pop(future)
+                    try:
+                        finish_job(job, key, future.result())
+                    except Exception as exc:
+                        fail_job(job, exc)
+                        self.stderr.write(f'Render job {job.id} failed: {exc}')
+                    else:
+                        elapsed = (time.monotonic() - started) * 1000
+                        self.stdout.write(f'Rendered job {job.id} in {elapsed:.0f} ms')
@@ -0,0 +1,298 @@
+"""
+Per-request performance metrics.
+
+``resumes.middleware.PerformanceMiddleware`` measures every request: query
+count and database time (through a connection execute wrapper), template
+time (through ``TimedDjangoTemplates``) and PDF render time, pages and bytes
+(reported by the renderers via ``record_pdf_render``).
+
+Each process keeps its own histograms and writes them to a file of its own
+in ``METRICS_DIR``; the ``metrics`` view merges every file it finds, so the
+totals cover all gunicorn workers. When a worker exits, its file is folded
+into ``retired.json`` (see ``retire_process``), so recycled workers do not
+leave a file behind each. Clear the directory when the server restarts, as
+with any Prometheus multi-process setup.
+"""
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+
+
+PREFIX = 'resume_builder_'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+# name: (help, buckets)
+HISTOGRAMS = {
+    'request_duration_seconds': ('Time spent handling the request', DURATION_BUCKETS),
+    'db_queries': ('Database queries per request', COUNT_BUCKETS),
+    'db_duration_seconds': ('Time spent in database queries per request', DURATION_BUCKETS),
+    'template_duration_seconds': ('Time spent rendering templates per request', DURATION_BUCKETS),
+    'pdf_render_duration_seconds': ('Time spent rendering PDFs per request', DURATION_BUCKETS),
+    'pdf_pages': ('Pages in rendered PDFs', COUNT_BUCKETS),
+    'pdf_bytes': ('Size of rendered PDFs', BYTES_BUCKETS),
+}
+
+
+class RequestMetrics:
+    """What one request spent its time on."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.pdf_renders = 0
+        self.pdf_time = 0.0
+        self.pdf_pages = 0
+        self.pdf_bytes = 0
+
+    def server_timing(self, total):
+        """Value for the ``Server-Timing`` header, durations in milliseconds."""
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="queries: {self.queries}"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+        ]
+        if self.pdf_renders:
+            entries.append(f'pdf;dur={self.pdf_time * 1000:.1f};desc="pages: {self.pdf_pages}, bytes: {self.pdf_bytes}"')
+        entries.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(entries)
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def start_request():
+    """Start collecting for the current request; returns a token for ``end_request``."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_pdf_render(seconds, pages=None, size=None):
+    """Called by the renderers after each PDF they render for a request."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.pdf_renders += 1
+    metrics.pdf_time += seconds
+    metrics.pdf_pages += pages or 0
+    metrics.pdf_bytes += size or 0
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Also fires on reconnects of a persistent connection.
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            if metrics is not None:
+                metrics.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each top-level render."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+class HistogramStore:
+    """
+    Cumulative histograms for one process, keyed by metric and view name,
+    written to ``<directory>/<pid>-<random>.json`` at most every
+    ``flush_interval`` seconds.
+    """
+
+    def __init__(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        # A fresh name per process, so a recycled pid never overwrites the
+        # totals of the worker that used it before.
+        self.path = os.path.join(directory, f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json')
+        self._data = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def observe(self, name, view, value):
+        buckets = HISTOGRAMS[name][1]
+        key = f'{name}|{view}'
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                entry = self._data[key] = {'buckets': [0] * len(buckets), 'sum': 0, 'count': 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry['buckets'][i] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def observe_request(self, view, duration, metrics):
+        self.observe('request_duration_seconds', view, duration)
+        self.observe('db_queries', view, metrics.queries)
+        self.observe('db_duration_seconds', view, metrics.db_time)
+        self.observe('template_duration_seconds', view, metrics.template_time)
+        if metrics.pdf_renders:
+            self.observe('pdf_render_duration_seconds', view, metrics.pdf_time)
+            self.observe('pdf_pages', view, metrics.pdf_pages)
+            self.observe('pdf_bytes', view, metrics.pdf_bytes)
+        self.flush()
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_flush < self.flush_interval:
+                return
+            self._last_flush = now
+            data = json.dumps(self._data)
+        _write_json(self.path, data)
+
+
+def _write_json(path, data):
+    # Write to a temp file and rename so readers never see half a file.
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """This process's histogram store; a forked worker gets a new one."""
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store = HistogramStore(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+            _store_pid = os.getpid()
+    return _store
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _merge(merged, data):
+    for key, entry in data.items():
+        total = merged.get(key)
+        if total is None:
+            merged[key] = entry
+            continue
+        total['buckets'] = [a + b for a, b in zip(total['buckets'], entry['buckets'])]
+        total['sum'] += entry['sum']
+        total['count'] += entry['count']
+    return merged
+
+
+def collect(directory):
+    """Sum the histograms of every process that wrote to ``directory``."""
+    merged = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return merged
+    for name in names:
+        if name.endswith('.json'):
+            _merge(merged, _read(os.path.join(directory, name)))
+    return merged
+
+
+RETIRED_FILE = 'retired.json'
+
+
+def retire_process(directory, pid):
+    """
+    Fold the histograms of the exited process ``pid`` into ``retired.json``
+    and remove its files. Called by the gunicorn master (gunicorn.conf.py),
+    which handles one exit at a time.
+    """
+    paths = glob.glob(os.path.join(directory, f'{pid}-*.json'))
+    if not paths:
+        return
+    retired_path = os.path.join(directory, RETIRED_FILE)
+    merged = _read(retired_path)
+    for path in paths:
+        _merge(merged, _read(path))
+    _write_json(retired_path, json.dumps(merged))
+    for path in paths:
+        os.unlink(path)
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(merged):
+    """Render merged histograms in the Prometheus text exposition format."""
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        series = sorted((key.split('|', 1)[1], entry) for key, entry in merged.items() if key.split('|', 1)[0] == name)
+        if not series:
+            continue
+        metric = PREFIX + name
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for view, entry in series:
+            view = _label(view)
+            for bound, count in zip(buckets, entry['buckets']):
+                lines.append(f'{metric}_bucket{{view="{view}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{view="{view}",le="+Inf"}} {entry["count"]}')
+            lines.append(f'{metric}_sum{{view="{view}"}} {entry["sum"]}')
+            lines.append(f'{metric}_count{{view="{view}"}} {entry["count"]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,61 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+
+class PerformanceMiddleware:
+    """
+    Measure each request (see ``resumes.metrics``), add a ``Server-Timing``
+    header and record the numbers in this process's histograms. Streamed
+    response bodies are produced after this returns and are not included.
+
+    Works in both sync and async stacks, so under ASGI the async views are
+    not pushed into a thread just to pass through here.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        request_metrics, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.record(request, response, request_metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        # Context variables follow the request into sync_to_async threads.
+        request_metrics, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.record(request, response, request_metrics, time.perf_counter() - start)
+
+    def record(self, request, response, request_metrics, duration):
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = request_metrics.server_timing(duration)
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.get_store().observe_request(view, duration, request_metrics)
+        return response
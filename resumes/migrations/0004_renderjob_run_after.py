@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0003_renderjob'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='renderjob',
+            name='resumes_ren_status_dc9708_idx',
+        ),
+        migrations.AddField(
+            model_name='renderjob',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='renderjob',
+            index=models.Index(fields=['status', 'run_after'], name='resumes_ren_status_f00c49_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+
+def _date(value):
+    return value.isoformat() if value else None
+
+
+def build_snapshots(apps, schema_editor):
+    # Mirrors Resume.build_snapshot(); historical models have no custom methods.
+    Resume = apps.get_model('resumes', 'Resume')
+    Education = apps.get_model('resumes', 'Education')
+    Experience = apps.get_model('resumes', 'Experience')
+    Skill = apps.get_model('resumes', 'Skill')
+
+    resume_ids = list(Resume.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(resume_ids), BATCH_SIZE):
+        batch = resume_ids[start:start + BATCH_SIZE]
+        snapshots = {
+            resume_id: {'education': [], 'experience': [], 'skills': []}
+            for resume_id in batch
+        }
+        for edu in Education.objects.filter(resume_id__in=batch).order_by('id'):
+            snapshots[edu.resume_id]['education'].append({
+                'id': edu.id,
+                'degree': edu.degree,
+                'institution': edu.institution,
+                'start_date': _date(edu.start_date),
+                'end_date': _date(edu.end_date),
+                'description': edu.description,
+            })
+        for exp in Experience.objects.filter(resume_id__in=batch).order_by('id'):
+            snapshots[exp.resume_id]['experience'].append({
+                'id': exp.id,
+                'job_title': exp.job_title,
+                'company': exp.company,
+                'start_date': _date(exp.start_date),
+                'end_date': _date(exp.end_date),
+                'description': exp.description,
+            })
+        for skill in Skill.objects.filter(resume_id__in=batch).order_by('id'):
+            snapshots[skill.resume_id]['skills'].append({
+                'id': skill.id,
+                'name': skill.name,
+                'proficiency': skill.proficiency,
+            })
+        resumes = list(Resume.objects.filter(id__in=batch))
+        for resume in resumes:
+            resume.snapshot = snapshots[resume.id]
+            resume.snapshot_version = 1
+        Resume.objects.bulk_update(resumes, ['snapshot', 'snapshot_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0004_renderjob_run_after'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='snapshot',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='snapshot_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(build_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0006_resume_user_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='section_versions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+# FTS5 index over resumes; see resumes/search.py. The column expressions
+# mirror search.indexed_columns().
+def _section(row, section, fields):
+    text = " || ' ' || ".join(f"coalesce(json_extract(value, '$.{name}'), '')" for name in fields)
+    return f"(SELECT group_concat({text}, char(10)) FROM json_each({row}.snapshot, '$.{section}'))"
+
+
+def _columns(row):
+    return ', '.join([
+        f'{row}.full_name',
+        f'{row}.summary',
+        _section(row, 'experience', ['job_title', 'company', 'description']),
+        _section(row, 'education', ['degree', 'institution', 'description']),
+        _section(row, 'skills', ['name']),
+    ])
+
+
+INSERT = 'INSERT INTO resumes_resume_fts (rowid, full_name, summary, experience, education, skills) '
+
+CREATE = [
+    "CREATE VIRTUAL TABLE resumes_resume_fts USING fts5("
+    "full_name, summary, experience, education, skills, "
+    "tokenize = 'porter unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER resumes_resume_fts_insert AFTER INSERT ON resumes_resume BEGIN
+        {INSERT} SELECT new.id, {_columns('new')};
+    END""",
+    f"""CREATE TRIGGER resumes_resume_fts_update AFTER UPDATE OF full_name, summary, snapshot ON resumes_resume BEGIN
+        DELETE FROM resumes_resume_fts WHERE rowid = old.id;
+        {INSERT} SELECT new.id, {_columns('new')};
+    END""",
+    """CREATE TRIGGER resumes_resume_fts_delete AFTER DELETE ON resumes_resume BEGIN
+        DELETE FROM resumes_resume_fts WHERE rowid = old.id;
+    END""",
+    f"{INSERT} SELECT resume.id, {_columns('resume')} FROM resumes_resume AS resume",
+]
+
+DROP = [
+    'DROP TRIGGER IF EXISTS resumes_resume_fts_insert',
+    'DROP TRIGGER IF EXISTS resumes_resume_fts_update',
+    'DROP TRIGGER IF EXISTS resumes_resume_fts_delete',
+    'DROP TABLE IF EXISTS resumes_resume_fts',
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Other databases search with icontains instead.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0007_resume_section_versions'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE), _run(DROP)),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0008_resume_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        # Nullable until 0010 has filled it in.
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='skills', to='resumes.canonicalskill'),
+        ),
+    ]
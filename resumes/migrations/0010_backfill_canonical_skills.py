@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def _normalize(name):
+    # Mirrors models.normalize_skill_name().
+    return ' '.join(name.split()).casefold()
+
+
+def link_skills(apps, schema_editor):
+    CanonicalSkill = apps.get_model('resumes', 'CanonicalSkill')
+    Skill = apps.get_model('resumes', 'Skill')
+
+    # Walk the table in id order, one batch at a time, so memory and the
+    # size of each statement stay bounded however many skills there are.
+    last_id = 0
+    while True:
+        skills = list(Skill.objects.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE])
+        if not skills:
+            break
+        spellings = {}
+        for skill in skills:
+            spellings.setdefault(_normalize(skill.name), ' '.join(skill.name.split()))
+        catalog = CanonicalSkill.objects.in_bulk(spellings, field_name='normalized_name')
+        CanonicalSkill.objects.bulk_create(
+            CanonicalSkill(name=spelling, normalized_name=key)
+            for key, spelling in spellings.items() if key not in catalog
+        )
+        catalog = CanonicalSkill.objects.in_bulk(spellings, field_name='normalized_name')
+        for skill in skills:
+            skill.canonical = catalog[_normalize(skill.name)]
+        Skill.objects.bulk_update(skills, ['canonical'])
+        last_id = skills[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0009_canonicalskill'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_skills, migrations.RunPython.noop),
+    ]
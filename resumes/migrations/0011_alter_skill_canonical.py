@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0010_backfill_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='skills', to='resumes.canonicalskill'),
+        ),
+    ]
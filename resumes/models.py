@@ -1,5 +1,47 @@
-from django.db import models
+from datetime import date
+from operator import attrgetter
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+SECTION_NAMES = ('education', 'experience', 'skills')
+
+# Written only by refresh_snapshot() and the bulk paths, never by save()
+SNAPSHOT_FIELDS = ('snapshot', 'snapshot_version', 'section_versions')
+
+
+class ResumeQuerySet(models.QuerySet):
+    def with_sections(self):
+        """
+        Load every section along with the resumes in one fixed set of
+        queries (one per section, however many rows there are). Afterwards
+        ``resume.education.all()``, ``.count()``, ``.exists()`` and
+        ``build_snapshot()`` work from memory.
+        """
+        return self.prefetch_related(
+            models.Prefetch('education', queryset=Education.objects.order_by('id')),
+            models.Prefetch('experience', queryset=Experience.objects.order_by('id')),
+            models.Prefetch('skills', queryset=Skill.objects.order_by('id')),
+        )
+
+    def for_dashboard(self, user):
+        """Only the columns a dashboard card shows; skips the large text fields."""
+        return self.filter(user=user).only(
+            'id', 'full_name', 'email', 'phone', 'created_at', 'updated_at',
+        )
+
+    def with_skill(self, name):
+        """Resumes listing skill ``name``, in any spelling (index lookups only)."""
+        return self.filter(skills__canonical__normalized_name=normalize_skill_name(name)).distinct()
+
+    def refresh_snapshots(self):
+        """Rebuild the section snapshot of every resume in the queryset."""
+        with transaction.atomic():
+            for resume in self.select_for_update():
+                resume.refresh_snapshot()
 
 
 class Resume(models.Model):
@@ -11,10 +53,116 @@ class Resume(models.Model):
     summary = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Materialized copy of the education, experience and skills rows so the
+    # edit page and the PDF renderer read a single row. Kept in sync by
+    # refresh_snapshot(); snapshot_version goes up on every refresh.
+    snapshot = models.JSONField(default=dict, blank=True)
+    snapshot_version = models.PositiveIntegerField(default=0)
+    # {section name: snapshot_version it last changed in}; keys the cached
+    # template fragments of each section
+    section_versions = models.JSONField(default=dict, blank=True)
+    
+    objects = ResumeQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Dashboard keyset pagination: WHERE user = ? ORDER BY updated_at
+            models.Index(fields=['user', 'updated_at'], name='resume_user_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.full_name}'s Resume"
 
+    def save(self, *args, **kwargs):
+        """
+        Updates leave the snapshot columns alone unless they are named in
+        ``update_fields``: an instance loaded before a concurrent
+        refresh_snapshot() (e.g. by the edit form) would otherwise write the
+        old snapshot back over the new one.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in SNAPSHOT_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def pdf_filename(self):
+        return f"{self.full_name.replace(' ', '_')}_Resume.pdf"
+
+    def to_document(self):
+        """
+        Plain, JSON-serialisable view of the resume and all of its sections,
+        read from this row alone. This is what the PDF renderer draws and
+        what the PDF cache hashes.
+        """
+        document = {
+            'full_name': self.full_name,
+            'email': self.email,
+            'phone': self.phone,
+            'address': self.address,
+            'summary': self.summary,
+        }
+        for name in SECTION_NAMES:
+            document[name] = self.snapshot.get(name, [])
+        return document
+
+    @cached_property
+    def sections(self):
+        """The snapshot with dates parsed back into ``date`` objects, for templates."""
+        def parse(entry):
+            entry = dict(entry)
+            for key in ('start_date', 'end_date'):
+                if entry.get(key):
+                    entry[key] = date.fromisoformat(entry[key])
+            return entry
+        return {name: [parse(entry) for entry in self.snapshot.get(name, [])] for name in SECTION_NAMES}
+
+    def build_snapshot(self):
+        """Build the snapshot from the section rows (prefetched ones if loaded)."""
+        snapshot = {}
+        for name in SECTION_NAMES:
+            rows = sorted(getattr(self, name).all(), key=attrgetter('id'))
+            snapshot[name] = [{'id': row.id, **row.to_document()} for row in rows]
+        return snapshot
+
+    def set_snapshot(self, snapshot, version):
+        """
+        Replace the snapshot (not saved). Only sections whose entries changed
+        move to ``version`` in ``section_versions``, so only their cached
+        fragments are re-rendered.
+        """
+        section_versions = dict(self.section_versions)
+        for name in SECTION_NAMES:
+            if snapshot.get(name) != self.snapshot.get(name):
+                section_versions[name] = version
+        self.snapshot = snapshot
+        self.snapshot_version = version
+        self.section_versions = section_versions
+        self.updated_at = timezone.now()
+        self.__dict__.pop('sections', None)
+
+    def refresh_snapshot(self):
+        """
+        Rebuild the snapshot from the section rows and bump its version. Call
+        it inside the transaction that changed the rows; the resume row is
+        locked first so concurrent refreshes cannot interleave.
+        """
+        if not transaction.get_connection().in_atomic_block:
+            raise transaction.TransactionManagementError('refresh_snapshot() must run inside a transaction.')
+        self.snapshot_version, self.snapshot, self.section_versions = (
+            Resume.objects.select_for_update()
+            .values_list('snapshot_version', 'snapshot', 'section_versions')
+            .get(pk=self.pk)
+        )
+        self.set_snapshot(self.build_snapshot(), self.snapshot_version + 1)
+        Resume.objects.filter(pk=self.pk).update(
+            snapshot=self.snapshot,
+            snapshot_version=self.snapshot_version,
+            section_versions=self.section_versions,
+            updated_at=self.updated_at,
+        )
+
 
 class Education(models.Model):
     resume = models.ForeignKey(
@@ -31,6 +179,15 @@ class Education(models.Model):
     def __str__(self):
         return f"{self.degree} at {self.institution}"
 
+    def to_document(self):
+        return {
+            'degree': self.degree,
+            'institution': self.institution,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'description': self.description,
+        }
+
 
 class Experience(models.Model):
     resume = models.ForeignKey(
@@ -47,6 +204,71 @@ class Experience(models.Model):
     def __str__(self):
         return f"{self.job_title} at {self.company}"
 
+    def to_document(self):
+        return {
+            'job_title': self.job_title,
+            'company': self.company,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'description': self.description,
+        }
+
+
+def normalize_skill_name(name):
+    """Catalog key of a skill name: trimmed, inner spaces collapsed, case-folded."""
+    return ' '.join(name.split()).casefold()
+
+
+class CanonicalSkillQuerySet(models.QuerySet):
+    def intern(self, names):
+        """
+        Return ``{normalized name: CanonicalSkill}`` for ``names``, adding
+        the ones not in the catalog yet. Takes one query when they all
+        exist and three otherwise, however many names there are.
+        """
+        spellings = {}
+        for name in names:
+            spellings.setdefault(normalize_skill_name(name), ' '.join(name.split()))
+        found = self.in_bulk(spellings, field_name='normalized_name')
+        missing = [
+            CanonicalSkill(name=spelling, normalized_name=key)
+            for key, spelling in spellings.items() if key not in found
+        ]
+        if missing:
+            # Another request may add the same names concurrently.
+            self.bulk_create(missing, ignore_conflicts=True)
+            found = self.in_bulk(spellings, field_name='normalized_name')
+        return found
+
+    def with_resume_counts(self):
+        """Annotate ``resume_count``: how many resumes list each skill."""
+        return self.annotate(resume_count=models.Count('skills__resume', distinct=True))
+
+
+class CanonicalSkill(models.Model):
+    """One entry per distinct skill, whatever its spelling on each resume."""
+
+    # Spelling the skill was first added with
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True)
+
+    objects = CanonicalSkillQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
+class SkillQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips save(), so link the catalog entries here.
+        objs = list(objs)
+        unlinked = [skill for skill in objs if skill.canonical_id is None]
+        if unlinked:
+            catalog = CanonicalSkill.objects.intern(skill.name for skill in unlinked)
+            for skill in unlinked:
+                skill.canonical = catalog[normalize_skill_name(skill.name)]
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class Skill(models.Model):
     resume = models.ForeignKey(
@@ -54,7 +276,14 @@ class Skill(models.Model):
         on_delete=models.CASCADE,
         related_name='skills'
     )
+    # As typed on this resume; lookups and counts go through ``canonical``
     name = models.CharField(max_length=100)
+    canonical = models.ForeignKey(
+        CanonicalSkill,
+        on_delete=models.PROTECT,
+        related_name='skills',
+        editable=False,
+    )
     
     PROFICIENCY_CHOICES = [
         ('Beginner', 'Beginner'),
@@ -68,5 +297,65 @@ class Skill(models.Model):
         choices=PROFICIENCY_CHOICES
     )
     
+    objects = SkillQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} ({self.proficiency})"
+
+    def save(self, *args, **kwargs):
+        key = normalize_skill_name(self.name)
+        if self.canonical_id is None or self.canonical.normalized_name != key:
+            self.canonical = CanonicalSkill.objects.intern([self.name])[key]
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'canonical'}
+        super().save(*args, **kwargs)
+
+    def to_document(self):
+        return {
+            'name': self.name,
+            'proficiency': self.proficiency,
+        }
+
+
+class RenderJob(models.Model):
+    """A queued PDF render, processed by ``manage.py render_worker``."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='render_jobs'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    # PDF cache key of the rendered document, set once the job is done
+    content_key = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Workers leave the job alone until then; used to debounce pre-renders
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
     def __str__(self):
-        return f"{self.name} ({self.proficiency})"
\ No newline at end of file
+        return f"Render of {self.resume} ({self.status})"
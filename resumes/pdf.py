@@ -0,0 +1,33 @@
+"""
+PDF renderer for resumes.
+
+The renderer works on a plain resume document (see ``Resume.to_document``)
+rather than on model instances, so it never touches the database and the
+same document can be hashed for caching.
+
+The drawing code lives in ``resumes.pdf_renderer`` and is imported on the
+first render, so processes that never render a PDF (most web requests, most
+management commands) never load reportlab.
+"""
+
+
+# Bump whenever the drawing code changes so cached PDFs are not reused.
+LAYOUT_VERSION = 2
+
+
+def _renderer():
+    from . import pdf_renderer
+    return pdf_renderer
+
+
+def render_resume_pdf(document, out):
+    """
+    Draw a professional PDF resume for ``document`` into the file-like ``out``.
+    Returns the number of pages written.
+    """
+    return _renderer().render_resume_pdf(document, out)
+
+
+def render_resume_pdf_bytes(document):
+    """Render ``document`` and return the PDF as bytes."""
+    return _renderer().render_resume_pdf_bytes(document)
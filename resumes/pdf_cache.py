@@ -0,0 +1,277 @@
+"""
+Content-addressed cache for generated resume PDFs.
+
+Entries are keyed by a hash of the full resume document (the resume row plus
+every Education, Experience and Skill row) and the renderer's layout
+version. Any change to the content produces a new key, so there is nothing to
+invalidate explicitly: stale entries simply stop being requested and age out
+of the two tiers below.
+
+* an in-process LRU bounded by entry count and total bytes
+* a shared disk tier under ``PDF_CACHE_DIR`` bounded by total bytes, evicting
+  the least recently used files first
+"""
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .metrics import record_pdf_render
+from .pdf import LAYOUT_VERSION, render_resume_pdf
+
+
+def content_key(document):
+    """Return the cache key for a resume document."""
+    payload = json.dumps(document, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f'{LAYOUT_VERSION}:{payload}'.encode('utf-8')).hexdigest()
+
+
+class MemoryTier:
+    """Thread-safe LRU of PDF bytes bounded by entry count and total size."""
+
+    def __init__(self, max_items, max_bytes):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, touch=True):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None and touch:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while len(self._entries) > self.max_items or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class DiskTier:
+    """
+    PDFs stored as ``<root>/<key[:2]>/<key>.pdf``. File mtimes are bumped on
+    every hit and the oldest files are removed once the directory grows past
+    ``max_bytes``. Safe to share between worker processes: the directory's
+    total size is kept in ``<root>/.size``, updated under a file lock by
+    every writer, so the limit holds however many processes write.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], f'{key}.pdf')
+
+    def open(self, key, touch=True):
+        """Return an open binary file for ``key``, or None on a miss."""
+        path = self.path(key)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        if touch:
+            os.utime(f.fileno())
+        return f
+
+    def get(self, key, touch=True):
+        f = self.open(key, touch)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def set(self, key, data):
+        self.set_file(key, BytesIO(data))
+
+    def set_file(self, key, src):
+        """Copy the rest of the file-like ``src`` into the cache under ``key``."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see partial PDFs.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(src, f)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._add(size)
+
+    def _add(self, size):
+        """Add ``size`` bytes to the shared total, evicting if it is over the limit."""
+        with open(os.path.join(self.root, '.size'), 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            recorded = f.read().strip()
+            # First write, or the file was damaged: count what is there.
+            total = int(recorded) + size if recorded.isdigit() else self._scan_size()
+            if total > self.max_bytes:
+                total = self._evict()
+            f.seek(0)
+            f.truncate()
+            f.write(str(total))
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self):
+        """Remove the least recently used files; returns the size left."""
+        # The total is also a guess after files were replaced or removed by
+        # hand, so rescan instead of trusting it.
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        # Trim to 90% so we do not rescan on every subsequent write.
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+
+class PDFCache:
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, touch=True):
+        """
+        Return the PDF for ``key`` or None. Without ``touch`` the lookup
+        leaves both tiers as they were, so bulk reads do not count as use.
+        """
+        data = self.memory.get(key, touch)
+        if data is None:
+            data = self.disk.get(key, touch)
+            if data is not None and touch:
+                self.memory.set(key, data)
+        return data
+
+    def open(self, key):
+        """
+        Return a readable binary file for ``key`` without loading disk
+        entries into memory, or None on a miss.
+        """
+        data = self.memory.get(key)
+        if data is not None:
+            return BytesIO(data)
+        return self.disk.open(key)
+
+    def set(self, key, data):
+        self.memory.set(key, data)
+        self.disk.set(key, data)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache():
+    """Return the process-wide PDF cache configured from settings."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PDFCache(
+                    MemoryTier(settings.PDF_CACHE_MEMORY_ITEMS, settings.PDF_CACHE_MEMORY_BYTES),
+                    DiskTier(settings.PDF_CACHE_DIR, settings.PDF_CACHE_DISK_BYTES),
+                )
+    return _cache
+
+
+@receiver(setting_changed)
+def _reset_pdf_cache(setting, **kwargs):
+    global _cache
+    if setting.startswith('PDF_CACHE_'):
+        _cache = None
+
+
+def get_or_render(document):
+    """Return the PDF bytes for ``document``, rendering only on a cache miss."""
+    cache = get_pdf_cache()
+    key = content_key(document)
+    data = cache.get(key)
+    if data is None:
+        start = time.perf_counter()
+        buffer = BytesIO()
+        pages = render_resume_pdf(document, buffer)
+        data = buffer.getvalue()
+        record_pdf_render(time.perf_counter() - start, pages, len(data))
+        cache.set(key, data)
+    return data
+
+
+def open_or_render(document):
+    """
+    Return a readable binary file positioned at the start of the PDF for
+    ``document``. Misses are rendered into a spooled temp file that only
+    spills to disk past ``PDF_SPOOL_MAX_MEMORY`` bytes, so large PDFs never
+    sit in worker memory. The caller owns (and must close) the file.
+    """
+    cache = get_pdf_cache()
+    key = content_key(document)
+    f = cache.open(key)
+    if f is not None:
+        return f
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.PDF_SPOOL_MAX_MEMORY)
+    try:
+        start = time.perf_counter()
+        pages = render_resume_pdf(document, spool)
+        size = spool.tell()
+        record_pdf_render(time.perf_counter() - start, pages, size)
+        spool.seek(0)
+        cache.disk.set_file(key, spool)
+        if size <= settings.PDF_SPOOL_MAX_MEMORY:
+            spool.seek(0)
+            cache.memory.set(key, spool.read())
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
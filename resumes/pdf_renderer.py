@@ -0,0 +1,261 @@
+"""
+Drawing code for resume PDFs; see ``resumes.pdf``, which loads this module
+(and reportlab with it) on the first render.
+"""
+from datetime import date
+from io import BytesIO
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.pdfgen import canvas
+
+from .layout import get_metrics
+
+
+def _format_date(value):
+    return date.fromisoformat(value).strftime('%b %Y')
+
+
+def _date_range(entry):
+    end = _format_date(entry['end_date']) if entry['end_date'] else 'Present'
+    return f"{_format_date(entry['start_date'])} - {end}"
+
+
+def render_resume_pdf(document, out):
+    """
+    Draw a professional PDF resume for ``document`` into the file-like ``out``.
+    Returns the number of pages written.
+    """
+    p = canvas.Canvas(out, pagesize=letter)
+    width, height = letter
+
+    # Define colors
+    primary_color = colors.HexColor('#2c3e50')
+    accent_color = colors.HexColor('#00d9ff')
+    text_color = colors.HexColor('#4a5568')
+
+    body = get_metrics("Helvetica", 10)
+
+    y = height - 50  # Start position from top
+
+    # ==================== HEADER SECTION ====================
+    # Name
+    p.setFont("Helvetica-Bold", 28)
+    p.setFillColor(primary_color)
+    p.drawCentredString(width/2, y, document['full_name'].upper())
+
+    # Contact Information
+    y -= 25
+    p.setFont("Helvetica", 11)
+    p.setFillColor(text_color)
+    contact_line = "  •  ".join(part for part in (document['email'], document['phone'], document['address']) if part)
+    p.drawCentredString(width/2, y, contact_line)
+
+    # Horizontal line under header
+    y -= 15
+    p.setStrokeColor(accent_color)
+    p.setLineWidth(2)
+    p.line(50, y, width-50, y)
+
+    y -= 35
+
+    # ==================== PROFESSIONAL SUMMARY ====================
+    if document['summary']:
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(accent_color)
+        p.drawString(50, y, "PROFESSIONAL SUMMARY")
+
+        y -= 5
+        p.setStrokeColor(accent_color)
+        p.setLineWidth(1)
+        p.line(50, y, 235, y)
+
+        y -= 20
+        p.setFont("Helvetica", 10)
+        p.setFillColor(text_color)
+
+        # Word wrap for summary
+        for line in body.wrap_text(document['summary'], width - 100):
+            p.drawString(50, y, line)
+            y -= 15
+
+        y -= 10
+
+    # ==================== WORK EXPERIENCE ====================
+    if document['experience']:
+        if y < 150:
+            p.showPage()
+            y = height - 50
+
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(accent_color)
+        p.drawString(50, y, "WORK EXPERIENCE")
+
+        y -= 5
+        p.setStrokeColor(accent_color)
+        p.setLineWidth(1)
+        p.line(50, y, 190, y)
+
+        y -= 25
+
+        for exp in document['experience']:
+            if y < 100:
+                p.showPage()
+                y = height - 50
+
+            # Job Title
+            p.setFont("Helvetica-Bold", 12)
+            p.setFillColor(primary_color)
+            p.drawString(50, y, exp['job_title'])
+
+            # Date (right aligned)
+            p.setFont("Helvetica", 10)
+            p.setFillColor(text_color)
+            date_str = _date_range(exp)
+            date_width = body.width(date_str)
+            p.drawString(width - 50 - date_width, y, date_str)
+
+            y -= 15
+
+            # Company
+            p.setFont("Helvetica-Oblique", 11)
+            p.setFillColor(text_color)
+            p.drawString(50, y, exp['company'])
+
+            y -= 18
+
+            # Description with bullet points
+            p.setFont("Helvetica", 10)
+            desc_lines = exp['description'].split('\n')
+
+            for line in desc_lines:
+                if line.strip():
+                    # Check if line starts with bullet
+                    if line.strip().startswith('•') or line.strip().startswith('-'):
+                        display_line = '  ' + line.strip()
+                    else:
+                        display_line = '  • ' + line.strip()
+
+                    # Word wrap if needed
+                    max_width = width - 120
+                    if body.width(display_line) > max_width:
+                        wrapped = body.wrap_text(display_line, max_width)
+                    else:
+                        wrapped = [display_line]
+                    for wrapped_line in wrapped:
+                        p.drawString(60, y, wrapped_line)
+                        y -= 12
+
+            y -= 15
+
+    # ==================== EDUCATION ====================
+    if document['education']:
+        if y < 150:
+            p.showPage()
+            y = height - 50
+
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(accent_color)
+        p.drawString(50, y, "EDUCATION")
+
+        y -= 5
+        p.setStrokeColor(accent_color)
+        p.setLineWidth(1)
+        p.line(50, y, 135, y)
+
+        y -= 25
+
+        for edu in document['education']:
+            if y < 100:
+                p.showPage()
+                y = height - 50
+
+            # Degree
+            p.setFont("Helvetica-Bold", 12)
+            p.setFillColor(primary_color)
+            p.drawString(50, y, edu['degree'])
+
+            # Date (right aligned)
+            p.setFont("Helvetica", 10)
+            p.setFillColor(text_color)
+            date_str = _date_range(edu)
+            date_width = body.width(date_str)
+            p.drawString(width - 50 - date_width, y, date_str)
+
+            y -= 15
+
+            # Institution
+            p.setFont("Helvetica-Oblique", 11)
+            p.drawString(50, y, edu['institution'])
+
+            y -= 15
+
+            # Description if exists
+            if edu['description']:
+                p.setFont("Helvetica", 10)
+                desc_lines = edu['description'].split('\n')
+                for line in desc_lines[:3]:  # Limit to 3 lines
+                    if line.strip():
+                        p.drawString(60, y, line.strip()[:80])
+                        y -= 12
+
+            y -= 15
+
+    # ==================== SKILLS ====================
+    if document['skills']:
+        if y < 150:
+            p.showPage()
+            y = height - 50
+
+        p.setFont("Helvetica-Bold", 14)
+        p.setFillColor(accent_color)
+        p.drawString(50, y, "SKILLS")
+
+        y -= 5
+        p.setStrokeColor(accent_color)
+        p.setLineWidth(1)
+        p.line(50, y, 100, y)
+
+        y -= 20
+
+        # Group skills by proficiency
+        skills_by_prof = {}
+        for skill in document['skills']:
+            prof = skill['proficiency']
+            if prof not in skills_by_prof:
+                skills_by_prof[prof] = []
+            skills_by_prof[prof].append(skill['name'])
+
+        # Display skills grouped by proficiency
+        p.setFont("Helvetica", 10)
+        p.setFillColor(text_color)
+
+        for proficiency in ['Expert', 'Advanced', 'Intermediate', 'Beginner']:
+            if proficiency in skills_by_prof:
+                p.setFont("Helvetica-Bold", 10)
+                p.setFillColor(primary_color)
+                p.drawString(50, y, f"{proficiency}:")
+
+                p.setFont("Helvetica", 10)
+                p.setFillColor(text_color)
+
+                # Word wrap skills, keeping the comma at the end of broken lines
+                lines = body.wrap_words(skills_by_prof[proficiency], width - 170, separator=', ')
+                for line in lines[:-1]:
+                    p.drawString(130, y, line + ',')
+                    y -= 12
+                p.drawString(130, y, lines[-1])
+                y -= 15
+
+    # Save PDF
+    pages = p.getPageNumber()
+    p.showPage()
+    p.save()
+    return pages
+
+
+def render_resume_pdf_bytes(document):
+    """Render ``document`` and return the PDF as bytes."""
+    buffer = BytesIO()
+    render_resume_pdf(document, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,124 @@
+"""
+Database-backed PDF render queue.
+
+Web requests enqueue ``RenderJob`` rows and ``manage.py render_worker``
+claims and renders them, so no broker beyond the app's own database (SQLite
+included) is needed. Finished PDFs are written to the shared disk tier of
+the PDF cache, where any web worker can serve them.
+"""
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RenderJob, Resume
+from .pdf_cache import content_key, get_pdf_cache
+
+
+def enqueue_render(resume):
+    """
+    Queue a render of ``resume`` and return its job, reusing a job that is
+    still waiting so repeated clicks do not pile up work. A debounced
+    pre-render that is waiting is brought forward, since a user now wants it.
+    Running jobs are never reused: they may have read the resume before its
+    latest change, while a waiting job reads it when it is claimed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            RenderJob.objects
+            .filter(resume=resume, status=RenderJob.PENDING)
+            .order_by('-created_at')
+            .first()
+        )
+        if job is None:
+            job = RenderJob.objects.create(resume=resume)
+        elif job.run_after > now:
+            RenderJob.objects.filter(id=job.id).update(run_after=now)
+    return job
+
+
+def schedule_render(resume_id, delay):
+    """
+    Queue a render of resume ``resume_id`` in ``delay`` seconds. Calls that
+    arrive while a job is still waiting push it back instead of adding a new
+    one, so a burst of edits coalesces into a single render.
+    """
+    run_after = timezone.now() + timedelta(seconds=delay)
+    with transaction.atomic():
+        updated = RenderJob.objects.filter(resume_id=resume_id, status=RenderJob.PENDING).update(
+            run_after=run_after,
+        )
+        if not updated and Resume.objects.filter(id=resume_id).exists():
+            RenderJob.objects.create(resume_id=resume_id, run_after=run_after)
+
+
+def claim_jobs(limit):
+    """
+    Atomically move up to ``limit`` pending jobs to running and return them.
+    The conditional UPDATE makes this safe with several workers polling.
+    """
+    claimed = []
+    candidates = (
+        RenderJob.objects
+        .filter(status=RenderJob.PENDING, run_after__lte=timezone.now())
+        .order_by('run_after')
+        .values_list('id', flat=True)[:limit]
+    )
+    for job_id in list(candidates):
+        updated = RenderJob.objects.filter(id=job_id, status=RenderJob.PENDING).update(
+            status=RenderJob.RUNNING,
+            started_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(job_id)
+    return list(RenderJob.objects.filter(id__in=claimed).order_by('run_after'))
+
+
+def requeue_stale_jobs(older_than):
+    """Put jobs stuck in running (e.g. after a worker crash) back in the queue."""
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    return RenderJob.objects.filter(status=RenderJob.RUNNING, started_at__lt=cutoff).update(
+        status=RenderJob.PENDING,
+        started_at=None,
+    )
+
+
+def prune_jobs(older_than):
+    """
+    Delete done and failed jobs that finished more than ``older_than``
+    seconds ago, so the queue table does not grow with every download.
+    """
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    deleted, _ = RenderJob.objects.filter(
+        status__in=[RenderJob.DONE, RenderJob.FAILED],
+        finished_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+def load_document(job):
+    """Return ``(key, document)`` for the job's resume as it is right now."""
+    resume = Resume.objects.get(id=job.resume_id)
+    document = resume.to_document()
+    return content_key(document), document
+
+
+def finish_job(job, key, data):
+    """Store the rendered PDF in the cache and mark the job done."""
+    get_pdf_cache().disk.set(key, data)
+    RenderJob.objects.filter(id=job.id).update(
+        status=RenderJob.DONE,
+        content_key=key,
+        error='',
+        finished_at=timezone.now(),
+    )
+
+
+def fail_job(job, exc):
+    RenderJob.objects.filter(id=job.id).update(
+        status=RenderJob.FAILED,
+        error=''.join(traceback.format_exception(exc)),
+        finished_at=timezone.now(),
+    )
@@ -0,0 +1,161 @@
+"""
+Full-text search over resumes.
+
+On SQLite, ``resumes_resume_fts`` is an FTS5 table with one row per resume
+(``rowid`` = resume id). Triggers on ``resumes_resume`` (migration 0008) keep
+it in sync: they index the name, the summary and the section snapshot, so
+every change that refreshes the snapshot, bulk ones included, reaches the
+index. ``manage.py rebuild_search_index`` rebuilds it from scratch.
+
+Other databases fall back to ``icontains`` filters, which is also the
+baseline ``manage.py benchmark_search`` measures against.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+FTS_TABLE = 'resumes_resume_fts'
+
+# Column weights for bm25(): full_name, summary, experience, education, skills
+WEIGHTS = (10.0, 2.0, 4.0, 2.0, 6.0)
+
+# Private-use characters around matches in snippets; replaced by <mark>
+# after the snippet is HTML-escaped.
+_MARK_START = '\ue000'
+_MARK_END = '\ue001'
+
+# Text of one resume row, as indexed. Shared by the triggers and the rebuild.
+_SECTION_TEXT = """(
+    SELECT group_concat({fields}, char(10))
+    FROM json_each({row}.snapshot, '$.{section}')
+)"""
+
+
+def _field(name):
+    return f"coalesce(json_extract(value, '$.{name}'), '')"
+
+
+def section_text(row, section, fields):
+    return _SECTION_TEXT.format(
+        row=row,
+        section=section,
+        fields=" || ' ' || ".join(_field(name) for name in fields),
+    )
+
+
+def indexed_columns(row):
+    """SQL expressions for the indexed columns of resume row alias ``row``."""
+    return [
+        f'{row}.full_name',
+        f'{row}.summary',
+        section_text(row, 'experience', ['job_title', 'company', 'description']),
+        section_text(row, 'education', ['degree', 'institution', 'description']),
+        section_text(row, 'skills', ['name']),
+    ]
+
+
+def rebuild_index():
+    """Reindex every resume; returns the number of rows indexed."""
+    columns = ', '.join(indexed_columns('resume'))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, full_name, summary, experience, education, skills) '
+            f'SELECT resume.id, {columns} FROM resumes_resume AS resume'
+        )
+        count = cursor.rowcount
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return count
+
+
+def fts_query(text, column=None):
+    """
+    FTS5 query for user input: every word must match, as a prefix so
+    partially typed words match too. Quoting keeps FTS5 syntax out. With
+    ``column``, the words must all match in that indexed column.
+    """
+    query = ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+    if query and column:
+        return f'{column} : ({query})'
+    return query
+
+
+def uses_fts():
+    return connection.vendor == 'sqlite'
+
+
+def filter_resumes(queryset, text, column=None):
+    """
+    Restrict ``queryset`` to resumes matching ``text`` (unranked), in one
+    indexed column if ``column`` is given. The fallback searches them all.
+    """
+    query = fts_query(text, column)
+    if not query:
+        return queryset.none()
+    if not uses_fts():
+        return icontains_filter(queryset, text)
+    return queryset.filter(id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [query]))
+
+
+def search_resumes(text, queryset, limit=20):
+    """
+    Up to ``limit`` resumes from ``queryset`` matching ``text``, best match
+    first. Each has ``search_snippet`` set: a bit of matching text with the
+    matched words in ``<mark>``.
+    """
+    query = fts_query(text)
+    if not query:
+        return []
+    if not uses_fts():
+        return list(icontains_filter(queryset, text)[:limit])
+
+    # The unary + keeps SQLite from handing the rowid filter to FTS5, which
+    # would then run the full-text query once per candidate id.
+    sql = (
+        f'SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, %s, 12) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({{ids}}) '
+        f'ORDER BY bm25({FTS_TABLE}, {", ".join(map(str, WEIGHTS))}) LIMIT %s'
+    )
+    ids_sql, ids_params = queryset.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql.format(ids=ids_sql),
+            [_MARK_START, _MARK_END, '\u2026', query, *ids_params, limit],
+        )
+        rows = cursor.fetchall()
+
+    resumes = queryset.in_bulk([resume_id for resume_id, _ in rows])
+    results = []
+    for resume_id, snippet in rows:
+        resume = resumes[resume_id]
+        resume.search_snippet = highlight(snippet)
+        results.append(resume)
+    return results
+
+
+def highlight(snippet):
+    text = escape(snippet or '')
+    return mark_safe(text.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+def icontains_filter(queryset, text):
+    """The plain ``LIKE`` version of the search, without an index."""
+    condition = Q()
+    for word in text.split():
+        condition &= (
+            Q(full_name__icontains=word)
+            | Q(summary__icontains=word)
+            | Q(experience__job_title__icontains=word)
+            | Q(experience__company__icontains=word)
+            | Q(experience__description__icontains=word)
+            | Q(education__degree__icontains=word)
+            | Q(education__institution__icontains=word)
+            | Q(education__description__icontains=word)
+            | Q(skills__name__icontains=word)
+        )
+    return queryset.filter(condition).distinct()
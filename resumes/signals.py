@@ -0,0 +1,48 @@
+"""
+Pre-render PDFs when a resume changes.
+
+Every save or delete of a resume or one of its sections schedules a
+debounced render job, so by the time the user clicks download the render
+worker has usually put a warm PDF in the cache. Controlled by the
+``PDF_PRERENDER_ON_SAVE`` and ``PDF_PRERENDER_DELAY`` settings.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Education, Experience, Resume, Skill
+from .render_queue import schedule_render
+
+
+def schedule_prerender(resume_id):
+    """
+    Schedule a pre-render of resume ``resume_id``. Called by the receivers
+    below, and directly after bulk operations that skip model signals.
+    """
+    if not settings.PDF_PRERENDER_ON_SAVE:
+        return
+    # Wait for the commit so the worker sees the new rows, and so a resume
+    # deleted in the same transaction (cascading to its sections) is skipped.
+    transaction.on_commit(lambda: schedule_render(resume_id, settings.PDF_PRERENDER_DELAY))
+
+
+@receiver(post_save, sender=Resume)
+def resume_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_prerender(instance.id)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_save, sender=Skill)
+def section_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_prerender(instance.resume_id)
+
+
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Experience)
+@receiver(post_delete, sender=Skill)
+def section_deleted(sender, instance, **kwargs):
+    schedule_prerender(instance.resume_id)
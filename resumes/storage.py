@@ -0,0 +1,95 @@
+"""
+Static files storage with hashed names and precompressed variants.
+
+``collectstatic`` writes every file under a content-hashed name (from
+``ManifestStaticFilesStorage``) and, next to each hashed file:
+
+* ``<name>.gz`` and ``<name>.br`` (with the ``Brotli`` package from
+  requirements.txt; skipped if it is missing) for text assets;
+* ``<name>.webp`` for PNG and JPEG images, converted with Pillow.
+
+A variant is only kept when it is smaller than the original. The
+``static_file`` view picks the best one the client accepts.
+"""
+import gzip
+import os
+from functools import cached_property
+from io import BytesIO
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.otf', '.eot'}
+WEBP_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+MIN_COMPRESS_SIZE = 256
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def to_webp(data, extension):
+    """WebP version of a PNG/JPEG image, or None if Pillow cannot write WebP."""
+    from PIL import Image, features
+
+    if not features.check('webp'):
+        return None
+    with Image.open(BytesIO(data)) as image:
+        out = BytesIO()
+        if extension == '.png':
+            image.save(out, 'WEBP', lossless=True, method=6)
+        else:
+            image.save(out, 'WEBP', quality=80, method=6)
+    return out.getvalue()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def stored_name(self, name):
+        # Before the first collectstatic (development, tests) there is no
+        # manifest; files keep their own names.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    @cached_property
+    def hashed_names(self):
+        """Names that carry a content hash and so never change."""
+        return set(self.hashed_files.values())
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            self.write_variants(hashed_name)
+
+    def write_variants(self, name):
+        extension = os.path.splitext(name)[1].lower()
+        path = self.path(name)
+        if extension not in COMPRESSIBLE_EXTENSIONS and extension not in WEBP_EXTENSIONS:
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        variants = {}
+        if extension in WEBP_EXTENSIONS:
+            variants['.webp'] = lambda: to_webp(data, extension)
+        elif len(data) >= MIN_COMPRESS_SIZE:
+            variants['.gz'] = lambda: gzip.compress(data, compresslevel=9, mtime=0)
+            brotli = _brotli()
+            if brotli is not None:
+                variants['.br'] = lambda: brotli.compress(data)
+
+        for suffix, encode in variants.items():
+            # Hashed names change with their content, so an existing
+            # variant is already up to date.
+            if os.path.exists(path + suffix):
+                continue
+            encoded = encode()
+            if encoded is not None and len(encoded) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(encoded)
@@ -1,3 +1,1616 @@
-from django.test import TestCase
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tarfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+import tempfile
+import threading
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.db import connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+
+from . import async_views, backends, benchmarks, db, metrics, render_queue, search, storage
+from .bulk import iter_zip
+from .forms import ResumeForm
+from .middleware import PerformanceMiddleware
+from .management.commands import export_resumes, import_resumes
+from .models import SECTION_NAMES, CanonicalSkill, RenderJob, Resume, Education, Experience, Skill
+from .pdf_cache import DiskTier, MemoryTier, content_key, get_pdf_cache, open_or_render
+
+
+def warm_login(client, user):
+    """Log in and make one request, so the session and user are cached."""
+    cache.clear()
+    client.force_login(user)
+    client.get(reverse('dashboard'))
+
+
+class TempPDFCacheMixin:
+    """Give each test an empty PDF cache of its own (see resumes/pdf_cache.py)."""
+
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        override = override_settings(PDF_CACHE_DIR=cache_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class PDFBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('bench')
+
+    def test_reports_metrics_for_every_scenario(self):
+        results = benchmarks.run(self.user, iterations=1)
+        self.assertEqual(set(results), set(benchmarks.SCENARIOS))
+        for metrics in results.values():
+            self.assertGreater(metrics['ms_per_resume'], 0)
+            self.assertGreaterEqual(metrics['pages'], 1)
+            self.assertGreater(metrics['peak_kib'], 0)
+        self.assertGreater(results['experience_50']['pages'], results['minimal']['pages'])
+
+    def test_query_count_does_not_grow_with_resume_size(self):
+        results = benchmarks.run(self.user, ['minimal', 'experience_50', 'skills_200'], iterations=1)
+        self.assertEqual(len({metrics['queries'] for metrics in results.values()}), 1)
+
+    def test_compare_flags_regressions_past_threshold(self):
+        baseline = {'minimal': {'ms_per_resume': 10.0, 'pages_per_second': 100.0, 'peak_kib': 500.0, 'queries': 4}}
+        within = {'minimal': {'ms_per_resume': 12.0, 'pages_per_second': 80.0, 'peak_kib': 600.0, 'queries': 4}}
+        self.assertEqual(benchmarks.compare(within, baseline, 0.25), [])
+
+        worse = {'minimal': {'ms_per_resume': 13.0, 'pages_per_second': 70.0, 'peak_kib': 500.0, 'queries': 5}}
+        regressions = benchmarks.compare(worse, baseline, 0.25)
+        self.assertEqual(
+            sorted(r.split(':')[0] for r in regressions),
+            ['minimal.ms_per_resume', 'minimal.pages_per_second', 'minimal.queries'],
+        )
+
+    def test_no_regression_against_baseline(self):
+        baseline = benchmarks.load_baseline(settings.PDF_BENCHMARK_BASELINE)
+        self.assertEqual(set(baseline), set(benchmarks.SCENARIOS))
+        # Timing metrics need a few iterations to mean anything.
+        timed = any(set(metrics) - benchmarks.EXACT_METRICS for metrics in baseline.values())
+        results = benchmarks.run(self.user, list(baseline), iterations=5 if timed else 1)
+        regressions = benchmarks.compare(results, baseline, settings.PDF_BENCHMARK_THRESHOLD)
+        self.assertEqual(regressions, [], 'PDF rendering regressed:\n' + '\n'.join(regressions))
+
+
+class ResumeLoaderTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('loader', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=2, education=1, skills=3)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+
+    def grow(self):
+        more = benchmarks.build_resume(self.user, experience=20, education=5, skills=50)
+        Experience.objects.filter(resume=more).update(resume=self.resume)
+        Education.objects.filter(resume=more).update(resume=self.resume)
+        Skill.objects.filter(resume=more).update(resume=self.resume)
+        with transaction.atomic():
+            self.resume.refresh_snapshot()
+
+    def test_sections_load_in_one_query_each(self):
+        with self.assertNumQueries(4):
+            resume = Resume.objects.with_sections().get(id=self.resume.id)
+            document = resume.to_document()
+            self.assertEqual(resume.education.count(), 1)
+            self.assertTrue(resume.skills.exists())
+            self.assertEqual(len(list(resume.experience.all())), 2)
+        self.assertEqual(len(document['skills']), 3)
+
+    def test_sections_are_ordered_by_insertion(self):
+        resume = Resume.objects.with_sections().get(id=self.resume.id)
+        ids = [exp.id for exp in resume.experience.all()]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_edit_page_query_count_is_constant(self):
+        url = reverse('edit_resume', args=[self.resume.id])
+        # Just the resume row; the session and user come from the cache.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        self.grow()
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertContains(response, 'Senior Engineer 19')
+
+    def test_download_query_count_is_constant(self):
+        url = reverse('download_resume', args=[self.resume.id])
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.grow()
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+
+class ResumeSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('snapshot', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=1)
+
+    def test_add_skill_updates_snapshot_and_version(self):
+        self.client.force_login(self.user)
+        version = self.resume.snapshot_version
+        self.client.post(
+            reverse('add_skill', args=[self.resume.id]),
+            {'name': 'Rust', 'proficiency': 'Beginner'},
+        )
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.snapshot_version, version + 1)
+        self.assertEqual(self.resume.snapshot['skills'][-1]['name'], 'Rust')
+        self.assertEqual(self.resume.snapshot, self.resume.build_snapshot())
+
+    def test_verify_and_rebuild_command(self):
+        Skill.objects.create(resume=self.resume, name='Go', proficiency='Expert')
+        with self.assertRaises(CommandError):
+            call_command('rebuild_snapshots', '--verify', stdout=StringIO())
+        call_command('rebuild_snapshots', stdout=StringIO())
+        call_command('rebuild_snapshots', '--verify', stdout=StringIO())
+
+    def add_skill(self, name):
+        with transaction.atomic():
+            Skill.objects.create(resume=self.resume, name=name, proficiency='Expert')
+            Resume.objects.get(id=self.resume.id).refresh_snapshot()
+
+    def test_basic_info_save_keeps_a_concurrent_snapshot(self):
+        # The edit view loads the resume, a section is added meanwhile, then
+        # the basic-info form saves the instance it loaded.
+        loaded = Resume.objects.get(id=self.resume.id)
+        self.add_skill('Elixir')
+        form = ResumeForm({
+            'full_name': 'Renamed', 'email': loaded.email, 'phone': loaded.phone,
+            'address': loaded.address, 'summary': loaded.summary,
+        }, instance=loaded)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        resume = Resume.objects.get(id=self.resume.id)
+        self.assertEqual(resume.full_name, 'Renamed')
+        self.assertEqual(resume.snapshot_version, self.resume.snapshot_version + 1)
+        self.assertEqual(resume.snapshot['skills'][-1]['name'], 'Elixir')
+        self.assertEqual(resume.snapshot, resume.build_snapshot())
+
+    def test_rebuild_keeps_an_edit_made_during_the_scan(self):
+        Skill.objects.create(resume=self.resume, name='Go', proficiency='Expert')
+        build_snapshot = Resume.build_snapshot
+        edited = []
+
+        def scan_then_edit(resume):
+            snapshot = build_snapshot(resume)
+            if not edited:
+                edited.append(True)
+                self.add_skill('Elixir')
+            return snapshot
+
+        with mock.patch.object(Resume, 'build_snapshot', autospec=True, side_effect=scan_then_edit):
+            call_command('rebuild_snapshots', stdout=StringIO())
+
+        resume = Resume.objects.get(id=self.resume.id)
+        self.assertEqual(resume.snapshot_version, self.resume.snapshot_version + 2)
+        self.assertEqual([skill['name'] for skill in resume.snapshot['skills']][-2:], ['Go', 'Elixir'])
+        self.assertEqual(resume.snapshot, resume.build_snapshot())
+        self.resume.refresh_from_db()
+        self.assertIn('Go', [skill['name'] for skill in self.resume.to_document()['skills']])
+
+
+@override_settings(DASHBOARD_PAGE_SIZE=3)
+class DashboardPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('paged', password='secret')
+        for i in range(7):
+            Resume.objects.create(user=cls.user, full_name=f'Person {i}', email='p@example.com', phone='1', address='x')
+        # Share a timestamp so the id tie-breaker is exercised.
+        Resume.objects.filter(user=cls.user).update(updated_at=timezone.now())
+
+    def test_pages_walk_every_resume_once(self):
+        self.client.force_login(self.user)
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(reverse('dashboard'), {'cursor': cursor} if cursor else {})
+            seen.extend(resume.id for resume in response.context['resumes'])
+            cursor = response.context['next_cursor']
+            if not cursor:
+                break
+        expected = list(Resume.objects.filter(user=self.user).order_by('-updated_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_shows_first_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(len(response.context['resumes']), 3)
+
+
+class BatchAddTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('batch', password='secret')
+        cls.resume = Resume.objects.create(user=cls.user, full_name='Batch', email='b@example.com', phone='1', address='x')
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+        self.url = reverse('batch_add', args=[self.resume.id])
+
+    def post_json(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json')
+
+    def test_json_batch_costs_constant_queries(self):
+        def payload(n):
+            return {
+                'skills': [{'name': f'Skill {i}', 'proficiency': 'Expert'} for i in range(n)],
+                'experience': [
+                    {'job_title': 'Dev', 'company': f'Co {i}', 'start_date': '2020-01-01', 'description': 'Work'}
+                    for i in range(n)
+                ],
+            }
+        with CaptureQueriesContext(connection) as small:
+            response = self.post_json(payload(2))
+        self.assertEqual(response.status_code, 201)
+        with CaptureQueriesContext(connection) as large:
+            response = self.post_json(payload(30))
+        self.assertEqual(response.json()['created'], {'education': 0, 'experience': 30, 'skills': 30})
+        self.assertEqual(len(small), len(large))
+
+        self.resume.refresh_from_db()
+        self.assertEqual(len(self.resume.snapshot['skills']), 32)
+
+    def test_invalid_entry_rejects_whole_batch(self):
+        response = self.post_json({'skills': [
+            {'name': 'Python', 'proficiency': 'Expert'},
+            {'name': 'Cobol', 'proficiency': 'Legendary'},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('proficiency', response.json()['errors']['skills']['entries'][1])
+        self.assertFalse(Skill.objects.filter(resume=self.resume).exists())
+
+    def test_formset_post_skips_blank_rows(self):
+        data = {
+            'education-TOTAL_FORMS': '1', 'education-INITIAL_FORMS': '0',
+            'experience-TOTAL_FORMS': '0', 'experience-INITIAL_FORMS': '0',
+            'skills-TOTAL_FORMS': '3', 'skills-INITIAL_FORMS': '0',
+            'skills-0-name': 'Django', 'skills-0-proficiency': 'Advanced',
+            'skills-2-name': 'SQL', 'skills-2-proficiency': 'Expert',
+        }
+        response = self.client.post(self.url, data)
+        self.assertRedirects(response, reverse('edit_resume', args=[self.resume.id]))
+        self.assertEqual(
+            sorted(Skill.objects.filter(resume=self.resume).values_list('name', flat=True)),
+            ['Django', 'SQL'],
+        )
+
+
+class ConditionalGetTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('conditional', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=2)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+        self.download_url = reverse('download_resume', args=[self.resume.id])
+
+    def test_download_revalidates_with_304(self):
+        response = self.client.get(self.download_url)
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+        # Only the resume row; no rendering
+        with self.assertNumQueries(1):
+            response = self.client.get(self.download_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_section_change_changes_etag(self):
+        etag = self.client.get(self.download_url)['ETag']
+        self.client.post(
+            reverse('add_skill', args=[self.resume.id]),
+            {'name': 'Go', 'proficiency': 'Expert'},
+        )
+        response = self.client.get(self.download_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_edit_page_with_messages_is_not_revalidated(self):
+        url = reverse('edit_resume', args=[self.resume.id])
+        self.client.get(url)  # sets the CSRF cookie the ETag covers
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # A basic-info save moves updated_at; the redirect shows a message.
+        response = self.client.post(url, {
+            'full_name': 'Renamed', 'email': 'r@example.com', 'phone': '1', 'address': 'x', 'summary': '',
+        }, follow=True)
+        self.assertContains(response, 'Resume updated successfully!')
+        self.assertFalse(response.has_header('ETag'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed')
+
+
+class PerformanceMetricsTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('metrics', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=2)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.metrics_dir = os.path.join(tmp.name, 'metrics')
+        override = override_settings(METRICS_DIR=self.metrics_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(setattr, metrics, '_store', None)
+        metrics._store = None
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('download_resume', args=[self.resume.id]))
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="queries: 1"', timing)
+        self.assertRegex(timing, r'pdf;dur=[\d.]+;desc="pages: 1, bytes: \d+"')
+        response = self.client.get(reverse('dashboard'))
+        self.assertNotIn('pdf;', response['Server-Timing'])
+        self.assertRegex(response['Server-Timing'], r'tpl;dur=[\d.]+')
+
+    def test_metrics_endpoint_merges_processes(self):
+        self.client.get(reverse('dashboard'))
+        # Histograms written by another worker process
+        other = metrics.HistogramStore(self.metrics_dir, flush_interval=0)
+        other.observe('request_duration_seconds', 'dashboard', 0.2)
+        other.flush(force=True)
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE resume_builder_request_duration_seconds histogram', body)
+        self.assertIn('resume_builder_request_duration_seconds_count{view="dashboard"} 2', body)
+        self.assertIn('resume_builder_db_queries_count{view="dashboard"} 1', body)
+
+    def test_exited_workers_are_folded_into_one_file(self):
+        for pid in (101, 102, 103):
+            worker = metrics.HistogramStore(self.metrics_dir, flush_interval=0)
+            worker.path = os.path.join(self.metrics_dir, f'{pid}-abcd1234.json')
+            worker.observe('request_duration_seconds', 'dashboard', 0.2)
+            worker.flush(force=True)
+        before = metrics.collect(self.metrics_dir)
+
+        metrics.retire_process(self.metrics_dir, 101)
+        metrics.retire_process(self.metrics_dir, 102)
+        metrics.retire_process(self.metrics_dir, 999)  # wrote nothing
+        self.assertEqual(sorted(os.listdir(self.metrics_dir)), ['103-abcd1234.json', metrics.RETIRED_FILE])
+        self.assertEqual(metrics.collect(self.metrics_dir), before)
+        self.assertEqual(before['request_duration_seconds|dashboard']['count'], 3)
+
+    def test_metrics_endpoint_is_restricted(self):
+        with override_settings(METRICS_ALLOWED_IPS=[]):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    def test_middleware_runs_async_under_asgi(self):
+        async def view(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(view)))
+        self.assertFalse(iscoroutinefunction(PerformanceMiddleware(lambda request: HttpResponse())))
+
+    async def test_server_timing_header_on_async_views(self):
+        await self.async_client.aforce_login(self.user)
+        with override_settings(ROOT_URLCONF=AsyncURLConf):
+            response = await self.async_client.get(reverse('dashboard'))
+            body = (await self.async_client.get(reverse('metrics'))).content.decode()
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        # Queries run in sync_to_async threads are counted too.
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="queries: [1-9]')
+        self.assertRegex(timing, r'tpl;dur=[\d.]+')
+        self.assertIn('resume_builder_request_duration_seconds_count{view="dashboard"} 1', body)
+
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    """Readers and a writer on one database file, each on its own connection."""
+
+    databases = {'default'}
+
+    def connect(self, path):
+        conn = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+        self.addCleanup(conn.close)
+        return conn
+
+    def open_pair(self, pragmas):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'db.sqlite3')
+        writer, reader = self.connect(path), self.connect(path)
+        for conn in (writer, reader):
+            db.apply_pragmas(conn.cursor(), pragmas)
+        writer.execute('CREATE TABLE entry (id INTEGER PRIMARY KEY, name TEXT)')
+        writer.execute("INSERT INTO entry (name) VALUES ('first')")
+        return writer, reader
+
+    def test_writer_commits_while_reader_is_reading(self):
+        writer, reader = self.open_pair(settings.SQLITE_PRAGMAS)
+        reader.execute('BEGIN')
+        self.assertEqual(reader.execute('SELECT count(*) FROM entry').fetchone(), (1,))
+
+        # No busy wait allowed (timeout=0): the write must not queue behind the reader.
+        writer.execute('BEGIN IMMEDIATE')
+        writer.execute("INSERT INTO entry (name) VALUES ('second')")
+        # ...and the reader is not blocked by the pending write either.
+        self.assertEqual(reader.execute('SELECT count(*) FROM entry').fetchone(), (1,))
+        writer.execute('COMMIT')
+
+        # The reader keeps its snapshot until its transaction ends.
+        self.assertEqual(reader.execute('SELECT count(*) FROM entry').fetchone(), (1,))
+        reader.execute('COMMIT')
+        self.assertEqual(reader.execute('SELECT count(*) FROM entry').fetchone(), (2,))
+
+    def test_rollback_journal_serializes(self):
+        # The old default, for comparison: the writer cannot commit while a read is open.
+        writer, reader = self.open_pair({'journal_mode': 'DELETE'})
+        reader.execute('BEGIN')
+        reader.execute('SELECT count(*) FROM entry').fetchone()
+        writer.execute('BEGIN IMMEDIATE')
+        writer.execute("INSERT INTO entry (name) VALUES ('second')")
+        with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+            writer.execute('COMMIT')
+
+    def test_parallel_readers_during_writes(self):
+        writer, _ = self.open_pair(settings.SQLITE_PRAGMAS)
+        path = writer.execute('PRAGMA database_list').fetchone()[2]
+        readers = [self.connect(path) for _ in range(4)]
+        errors = []
+        done = threading.Event()
+
+        def read(conn):
+            try:
+                while not done.is_set():
+                    conn.execute('SELECT count(*) FROM entry').fetchone()
+            except sqlite3.Error as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=read, args=(conn,)) for conn in readers]
+        for thread in threads:
+            thread.start()
+        try:
+            for i in range(200):
+                writer.execute('INSERT INTO entry (name) VALUES (?)', (f'row {i}',))
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+
+    def test_pragmas_are_applied_to_django_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone(), (1,))  # NORMAL
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone(), (2,))  # MEMORY
+
+    def journal_mode(self, path):
+        wrapper = SQLiteDatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='journal')
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            return cursor.fetchone()[0]
+
+    def test_checked_in_database_keeps_its_journal_mode(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        kept, other = os.path.join(tmp.name, 'kept.sqlite3'), os.path.join(tmp.name, 'other.sqlite3')
+        with override_settings(SQLITE_KEEP_JOURNAL_MODE=[kept]):
+            self.assertEqual(self.journal_mode(kept), 'delete')
+            self.assertEqual(self.journal_mode(other), 'wal')
+
+
+class CachedAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cached', password='secret')
+        Resume.objects.create(user=cls.user, full_name='Cached', email='c@example.com', phone='1', address='x')
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+
+    def test_warm_dashboard_does_no_auth_queries(self):
+        # The dashboard's own page query; nothing for the session or user.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, 'Cached')
+
+    def test_password_change_invalidates_cached_user(self):
+        self.user.set_password('changed')
+        self.user.save()
+        response = self.client.get(reverse('dashboard'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('dashboard')}")
+
+    def test_logout_drops_cached_user(self):
+        self.assertIsNotNone(cache.get(backends.user_cache_key(self.user.pk)))
+        self.client.get(reverse('logout'))
+        self.assertIsNone(cache.get(backends.user_cache_key(self.user.pk)))
+
+    def test_sessions_from_before_the_cached_backend_stay_valid(self):
+        self.client.logout()
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+
+    def test_invalidation_reaches_other_processes(self):
+        # E.g. a password change handled by another gunicorn worker, which
+        # needs the file cache the suite otherwise swaps for locmem.
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        file_cache = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cache_dir.name,
+        }}
+        with override_settings(CACHES=file_cache):
+            warm_login(self.client, self.user)
+            key = backends.user_cache_key(self.user.pk)
+            self.assertIsNotNone(cache.get(key))
+            subprocess.run(
+                [sys.executable, '-c', f'import django; django.setup(); from django.core.cache import cache; cache.delete({key!r})'],
+                check=True, cwd=settings.BASE_DIR,
+                env={
+                    **os.environ, 'DJANGO_SETTINGS_MODULE': 'resume_builder.settings',
+                    'CACHE_BACKEND': 'file', 'CACHE_DIR': cache_dir.name,
+                },
+            )
+            self.assertIsNone(cache.get(key))
+
+
+class FragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('fragments', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=1)
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+
+    def section_key(self, resume, name):
+        return make_template_fragment_key('resume_section', [resume.id, name, resume.section_versions.get(name, '')])
+
+    def test_only_the_changed_section_is_invalidated(self):
+        self.client.get(reverse('edit_resume', args=[self.resume.id]))
+        before = {name: self.section_key(self.resume, name) for name in SECTION_NAMES}
+        self.assertTrue(all(cache.get(key) for key in before.values()))
+
+        self.client.post(reverse('add_skill', args=[self.resume.id]), {'name': 'Rust', 'proficiency': 'Expert'})
+        resume = Resume.objects.get(id=self.resume.id)
+        self.assertNotEqual(self.section_key(resume, 'skills'), before['skills'])
+        self.assertEqual(self.section_key(resume, 'education'), before['education'])
+        self.assertEqual(self.section_key(resume, 'experience'), before['experience'])
+
+        response = self.client.get(reverse('edit_resume', args=[self.resume.id]))
+        self.assertContains(response, 'Rust - Expert')
+        self.assertContains(response, 'Senior Engineer 0')
+
+    def test_dashboard_card_follows_updated_at(self):
+        self.client.get(reverse('dashboard'))
+        self.client.post(reverse('edit_resume', args=[self.resume.id]), {
+            'full_name': 'Renamed Candidate', 'email': 'r@example.com', 'phone': '1', 'address': 'x', 'summary': '',
+        })
+        self.assertContains(self.client.get(reverse('dashboard')), 'Renamed Candidate')
+
+
+class StartupImportTests(SimpleTestCase):
+    def import_times(self):
+        """``{module: cumulative microseconds}`` for a fresh interpreter loading the app."""
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import resume_builder.wsgi, resume_builder.urls'],
+            capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'resume_builder.settings'},
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+        return times
+
+    def test_startup_does_not_load_the_pdf_stack(self):
+        times = self.import_times()
+        self.assertNotIn('reportlab', times)
+        self.assertNotIn('resumes.pdf_renderer', times)
+        startup_ms = (times['resume_builder.wsgi'] + times['resume_builder.urls']) / 1000
+        self.assertLess(
+            startup_ms, settings.STARTUP_IMPORT_BUDGET_MS,
+            f'Importing the app took {startup_ms:.0f} ms',
+        )
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_reports_throughput_for_logged_in_page(self):
+        user = User.objects.create_user('loadtest', password='secret')
+        Resume.objects.create(user=user, full_name='Load Test', email='l@example.com', phone='1', address='x')
+        out = StringIO()
+        call_command(
+            'loadtest', url=self.live_server_url, path=reverse('dashboard'),
+            user='loadtest', concurrency=2, duration=0.5, stdout=out,
+        )
+        self.assertRegex(out.getvalue(), r'server: [1-9]\d* requests in [\d.]+s, [\d.]+ req/s, 0 errors')
+
+
+class StaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls.static_root.cleanup)
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.static_root.name))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_collectstatic_writes_hashed_and_precompressed_files(self):
+        css = staticfiles_storage.stored_name('admin/css/base.css')
+        self.assertNotEqual(css, 'admin/css/base.css')
+        self.assertTrue(os.path.exists(os.path.join(self.static_root.name, css + '.gz')))
+        png = staticfiles_storage.stored_name('images/real.png')
+        self.assertNotEqual(png, 'images/real.png')
+        self.assertTrue(os.path.exists(os.path.join(self.static_root.name, png + '.webp')))
+
+    def test_serves_best_variant_with_immutable_headers(self):
+        url = staticfiles_storage.url('admin/css/base.css')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertFalse(self.client.get(url).has_header('Content-Encoding'))
+
+        url = staticfiles_storage.url('images/real.png')
+        response = self.client.get(url, HTTP_ACCEPT='image/avif,image/webp,*/*')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='image/png')['Content-Type'], 'image/png')
+
+    def test_serves_brotli_when_accepted(self):
+        if storage._brotli() is None:
+            self.skipTest('Brotli is not installed')
+        css = staticfiles_storage.stored_name('admin/css/base.css')
+        self.assertTrue(os.path.exists(os.path.join(self.static_root.name, css + '.br')))
+        response = self.client.get(staticfiles_storage.url('admin/css/base.css'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_unhashed_names_are_revalidated(self):
+        response = self.client.get('/static/images/real.png')
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response = self.client.get('/static/images/real.png', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/static/../settings.py').status_code, 404)
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('searcher', password='secret')
+        cls.other = User.objects.create_user('other', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=1)
+        Resume.objects.filter(id=cls.resume.id).update(full_name='Ada Lovelace')
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+
+    def search(self, text, user=None):
+        return [r.id for r in search.search_resumes(text, Resume.objects.filter(user=user or self.user))]
+
+    def test_index_follows_section_changes(self):
+        self.assertEqual(self.search('rust'), [])
+        self.client.post(reverse('add_skill', args=[self.resume.id]), {'name': 'Rust', 'proficiency': 'Expert'})
+        self.assertEqual(self.search('rust'), [self.resume.id])
+
+        Skill.objects.filter(resume=self.resume, name='Rust').delete()
+        Resume.objects.get(id=self.resume.id).refresh_snapshot()
+        self.assertEqual(self.search('rust'), [])
+
+        self.assertEqual(self.search('company 0'), [self.resume.id])
+        self.resume.delete()
+        self.assertEqual(self.search('company'), [])
+
+    def test_prefix_stemming_and_ranking(self):
+        summary_only = benchmarks.build_resume(self.user)
+        Resume.objects.filter(id=summary_only.id).update(summary='Worked with Lovelace machines')
+        self.assertEqual(self.search('lovel'), [self.resume.id, summary_only.id])
+        # Porter stemming: "shipping" finds "shipped".
+        self.assertIn(self.resume.id, self.search('shipping'))
+        self.assertEqual(self.search('"); DROP TABLE --'), [])
+
+    def test_dashboard_search_is_scoped_and_highlighted(self):
+        benchmarks.build_resume(self.other)
+        Resume.objects.filter(user=self.other).update(full_name='Ada Other')
+        Skill.objects.filter(resume=self.resume).update(name='<b>Zebra</b>')
+        Resume.objects.get(id=self.resume.id).refresh_snapshot()
+
+        response = self.client.get(reverse('dashboard'), {'q': 'ada'})
+        self.assertEqual([r.id for r in response.context['resumes']], [self.resume.id])
+        self.assertNotContains(response, 'Ada Other')
+
+        response = self.client.get(reverse('dashboard'), {'q': 'zebra'})
+        self.assertContains(response, '&lt;b&gt;<mark>Zebra</mark>&lt;/b&gt;')
+
+        response = self.client.get(reverse('dashboard'), {'q': 'nothing-here'})
+        self.assertContains(response, 'No resumes match')
+
+    def test_matches_icontains_baseline(self):
+        queryset = Resume.objects.all()
+        for text in ('senior engineer', 'university', 'ada', 'missing'):
+            self.assertEqual(
+                set(search.filter_resumes(queryset, text).values_list('id', flat=True)),
+                set(search.icontains_filter(queryset, text).values_list('id', flat=True)),
+            )
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.FTS_TABLE}')
+        self.assertEqual(self.search('ada'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 1 resumes', out.getvalue())
+        self.assertEqual(self.search('ada'), [self.resume.id])
+
+    def test_admin_search_uses_index(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:resumes_resume_changelist'), {'q': 'company 0'})
+        self.assertEqual([r.id for r in response.context['cl'].result_list], [self.resume.id])
+
+    def test_benchmark_reports_both_strategies(self):
+        benchmarks.build_search_corpus(self.other, 30)
+        results = benchmarks.measure_search(self.other, ['python', 'acme'], iterations=1)
+        for metrics in results.values():
+            self.assertEqual(metrics['fts_matches'], metrics['icontains_matches'])
+            self.assertGreater(metrics['icontains_ms'], 0)
+
+
+class SkillCatalogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('catalog', password='secret')
+        cls.resumes = [
+            Resume.objects.create(user=cls.user, full_name=f'R{i}', email='r@example.com', phone='1', address='x')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+
+    def test_spellings_share_one_catalog_entry(self):
+        for resume, name in zip(self.resumes, ['Python', ' python ', 'PYTHON']):
+            self.client.post(reverse('add_skill', args=[resume.id]), {'name': name, 'proficiency': 'Expert'})
+        Skill.objects.create(resume=self.resumes[0], name='Machine  Learning', proficiency='Beginner')
+
+        self.assertEqual(
+            sorted(CanonicalSkill.objects.values_list('normalized_name', flat=True)),
+            ['machine learning', 'python'],
+        )
+        self.assertEqual(CanonicalSkill.objects.get(normalized_name='python').name, 'Python')
+        # Each resume keeps its own spelling.
+        self.assertEqual(Skill.objects.get(resume=self.resumes[2]).name, 'PYTHON')
+        self.assertEqual(set(Resume.objects.with_skill('pYthon')), set(self.resumes))
+        counts = dict(CanonicalSkill.objects.with_resume_counts().values_list('normalized_name', 'resume_count'))
+        self.assertEqual(counts, {'python': 3, 'machine learning': 1})
+
+    def test_renaming_relinks(self):
+        skill = Skill.objects.create(resume=self.resumes[0], name='Go', proficiency='Expert')
+        skill.name = 'Rust'
+        skill.save(update_fields=['name'])
+        skill.refresh_from_db()
+        self.assertEqual(skill.canonical.normalized_name, 'rust')
+
+    def test_bulk_paths_intern_in_constant_queries(self):
+        def payload(names):
+            return json.dumps({'skills': [{'name': name, 'proficiency': 'Expert'} for name in names]})
+
+        url = reverse('batch_add', args=[self.resumes[0].id])
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, payload(['A', 'B']), content_type='application/json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(url, payload([f'New {i}' for i in range(40)] + ['a', 'B ']), content_type='application/json')
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(CanonicalSkill.objects.count(), 42)
+        self.assertFalse(Skill.objects.filter(canonical__isnull=True).exists())
+
+    def test_skill_lookup_uses_indexes(self):
+        queryset = Resume.objects.with_skill('python')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('resumes_canonicalskill USING', plan)
+        self.assertIn('resumes_skill USING INDEX', plan)
+        self.assertNotIn('SCAN resumes_skill', plan)
+
+
+class AdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        cls.user = User.objects.create_user('owner')
+        cls.resume = benchmarks.build_resume(cls.user, experience=2, education=2, skills=3)
+
+    def setUp(self):
+        warm_login(self.client, self.admin)
+
+    def changelist(self, model, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:resumes_{model}_changelist'), params)
+        self.assertEqual(response.status_code, 200)
+        return response, queries
+
+    def test_change_lists_do_not_grow_with_rows(self):
+        for model in ('resume', 'education', 'experience', 'skill', 'renderjob'):
+            _, before = self.changelist(model)
+            benchmarks.build_resume(self.user, experience=2, education=2, skills=3).render_jobs.create()
+            _, after = self.changelist(model)
+            self.assertEqual(len(before), len(after), model)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=3)
+    def test_big_tables_use_an_estimated_count(self):
+        benchmarks.build_resume(self.user, skills=10)
+        response, queries = self.changelist('skill')
+        self.assertEqual(response.context['cl'].result_count, Skill.objects.order_by('-id')[0].id)
+        self.assertFalse([q for q in queries if 'COUNT(*)' in q['sql'] and 'resumes_skill' in q['sql']])
+
+        # Filtered lists are small enough to count exactly.
+        response, _ = self.changelist('skill', q='skill 1')
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_skill_search_is_a_catalog_range_scan(self):
+        response, _ = self.changelist('skill', q='SKILL 2')
+        self.assertEqual([s.name for s in response.context['cl'].result_list], ['Skill 2'])
+
+    def test_section_search_returns_matching_entries_only(self):
+        response, _ = self.changelist('experience', q='company 1')
+        self.assertEqual([e.company for e in response.context['cl'].result_list], ['Company 1'])
+        response, _ = self.changelist('education', q='univ 0')
+        self.assertEqual([e.institution for e in response.context['cl'].result_list], ['University 0'])
+        # Text from other sections or the resume itself matches nothing.
+        for model, term in (('education', 'company'), ('experience', 'university'), ('experience', 'benchmark')):
+            response, _ = self.changelist(model, q=term)
+            self.assertEqual(list(response.context['cl'].result_list), [], (model, term))
+
+    def test_resume_autocomplete_searches_the_index(self):
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'resumes', 'model_name': 'skill', 'field_name': 'resume', 'term': 'bench',
+        })
+        self.assertEqual([r['id'] for r in response.json()['results']], [str(self.resume.id)])
+
+    def test_inline_edits_refresh_the_snapshot(self):
+        url = reverse('admin:resumes_resume_change', args=[self.resume.id])
+        form = self.client.get(url).context['adminform'].form
+        data = {field: form.initial.get(field) or '' for field in form.fields}
+        data['user'] = self.user.id
+        for prefix, rows in (('education', self.resume.education.all()), ('experience', self.resume.experience.all())):
+            data.update({f'{prefix}-TOTAL_FORMS': len(rows), f'{prefix}-INITIAL_FORMS': len(rows)})
+            for index, row in enumerate(rows):
+                data[f'{prefix}-{index}-id'] = row.id
+                data[f'{prefix}-{index}-resume'] = self.resume.id
+                for field, value in row.to_document().items():
+                    data[f'{prefix}-{index}-{field}'] = value or ''
+        skills = list(self.resume.skills.all())
+        data.update({'skills-TOTAL_FORMS': len(skills), 'skills-INITIAL_FORMS': len(skills)})
+        for index, skill in enumerate(skills):
+            data.update({
+                f'skills-{index}-id': skill.id,
+                f'skills-{index}-resume': self.resume.id,
+                f'skills-{index}-name': 'Haskell' if index == 0 else skill.name,
+                f'skills-{index}-proficiency': skill.proficiency,
+            })
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.snapshot['skills'][0]['name'], 'Haskell')
+        self.assertEqual(Skill.objects.get(id=skills[0].id).canonical.normalized_name, 'haskell')
+
+
+def json_resume(i, **basics):
+    return {
+        'basics': {
+            'name': f'Imported {i}', 'email': f'i{i}@example.com', 'phone': '555 0100',
+            'location': {'city': 'Lyon', 'countryCode': 'FR'}, **basics,
+        },
+        'work': [{'name': 'Acme', 'position': 'Engineer', 'startDate': '2019-03', 'highlights': ['Shipped it']}],
+        'education': [{'institution': 'MIT', 'area': 'CS', 'studyType': 'BSc', 'startDate': '2010'}],
+        'skills': [{'name': ' python', 'level': 'Master'}, {'name': 'SQL'}],
+    }
+
+
+class ImportResumesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('importer')
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def run_import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_resumes', path, user='importer', stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_json_resume_array(self):
+        documents = [json_resume(i) for i in range(5)] + [json_resume(5, email='nope')]
+        out, err = self.run_import(self.write('org.json', json.dumps(documents)), batch_size=2)
+        self.assertIn('Imported 5 resumes (25 rows)', out)
+        self.assertIn('Record 6: email', err)
+
+        resume = Resume.objects.get(full_name='Imported 3')
+        self.assertEqual(resume.user, self.user)
+        self.assertEqual(resume.address, 'Lyon, FR')
+        document = resume.to_document()
+        self.assertEqual(document['experience'][0]['start_date'], '2019-03-01')
+        self.assertEqual(document['experience'][0]['description'], '- Shipped it')
+        self.assertEqual(document['education'][0]['degree'], 'BSc CS')
+        self.assertEqual([s['proficiency'] for s in document['skills']], ['Expert', 'Intermediate'])
+        self.assertEqual(Resume.objects.with_skill('Python').count(), 5)
+        self.assertEqual(CanonicalSkill.objects.count(), 2)
+        self.assertEqual(len(search.search_resumes('acme', Resume.objects.all())), 5)
+
+    def test_minimal_json_resumes(self):
+        documents = [
+            {'basics': {'name': 'Only Basics', 'email': 'basics@example.com'}},
+            {
+                'basics': {'name': 'Sparse Sections', 'email': 'sparse@example.com'},
+                'work': [{'name': 'Acme', 'startDate': '2020'}, {'position': 'Volunteer'}],
+                'education': [{'institution': 'MIT', 'endDate': '2012-06'}],
+                'skills': [{'name': 'Go'}],
+            },
+            {'basics': {'name': 'No Email'}},
+        ]
+        out, err = self.run_import(self.write('minimal.json', json.dumps(documents)))
+        self.assertIn('Imported 2 resumes (5 rows)', out)
+        self.assertIn('Record 3: email', err)
+
+        resume = Resume.objects.get(full_name='Only Basics')
+        self.assertEqual((resume.phone, resume.address), ('', ''))
+        document = Resume.objects.get(full_name='Sparse Sections').to_document()
+        self.assertEqual(
+            [(e['company'], e['job_title'], e['start_date'], e['description']) for e in document['experience']],
+            [('Acme', '', '2020-01-01', '')],
+        )
+        self.assertEqual(
+            [(e['institution'], e['degree'], e['start_date']) for e in document['education']],
+            [('MIT', '', '2012-06-01')],
+        )
+
+    def test_resumes_from_checkpoint_after_a_failure(self):
+        lines = [json.dumps(json_resume(i)) for i in range(7)] + ['{not json']
+        path = self.write('org.ndjson', '\n'.join(lines) + '\n')
+        checkpoint = os.path.join(self.dir.name, 'checkpoint.json')
+        save_batch = import_resumes.save_batch
+
+        def fail_on_third_batch(user, batch, calls=[]):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError('disk full')
+            return save_batch(user, batch)
+
+        with mock.patch.object(import_resumes, 'save_batch', fail_on_third_batch):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, batch_size=2, checkpoint=checkpoint)
+        self.assertEqual(Resume.objects.count(), 4)
+
+        out, err = self.run_import(path, batch_size=2, checkpoint=checkpoint)
+        self.assertIn('Continuing after record 4', out)
+        self.assertIn('Record 8: invalid JSON', err)
+        self.assertEqual(
+            sorted(Resume.objects.values_list('full_name', flat=True)),
+            [f'Imported {i}' for i in range(7)],
+        )
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_streams_json_arrays(self):
+        text = json.dumps([{'n': i, 'text': 'x' * 50} for i in range(20)])
+        elements = list(import_resumes.iter_json_array(StringIO(text), chunk_size=16))
+        self.assertEqual([e['n'] for e in elements], list(range(20)))
+        with self.assertRaises(CommandError):
+            list(import_resumes.iter_json_array(StringIO(text[:-40]), chunk_size=16))
+        # Numbers split by a chunk boundary
+        self.assertEqual(list(import_resumes.iter_json_array(StringIO('[1234567, 89.5, true]'), chunk_size=3)), [1234567, 89.5, True])
+
+    def test_bad_json_array_elements_fail_fast(self):
+        elements = [json.dumps({'n': i, 'text': 'x' * 50}) for i in range(1000)]
+        elements[3] = '{"n": 3, oops}'
+        stream = StringIO('[' + ', '.join(elements) + ']')
+        with self.assertRaisesMessage(CommandError, 'Invalid JSON array element at character 226'):
+            list(import_resumes.iter_json_array(stream, chunk_size=64))
+        self.assertLess(stream.tell(), 1000)
+
+        elements[3] = json.dumps({'n': 3, 'text': 'x' * 100_000})
+        stream = StringIO('[' + ', '.join(elements) + ']')
+        with self.assertRaisesMessage(CommandError, 'is longer than 4096 characters'):
+            list(import_resumes.iter_json_array(stream, chunk_size=64, max_element_size=4096))
+        self.assertLess(stream.tell(), 5000)
+
+
+class ExportResumesTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('exporter')
+        cls.resumes = [benchmarks.build_resume(cls.user, experience=2, education=1, skills=3) for _ in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def export(self, **options):
+        err = StringIO()
+        call_command('export_resumes', stdout=StringIO(), stderr=err, **options)
+        return err.getvalue()
+
+    def test_ndjson_round_trips_through_import(self):
+        path = os.path.join(self.dir.name, 'export.ndjson')
+        report = self.export(output=path)
+        self.assertIn('Exported 3 resumes', report)
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['id'] for r in records], [r.id for r in self.resumes])
+        self.assertEqual(records[0]['user'], 'exporter')
+
+        User.objects.create_user('copy')
+        call_command('import_resumes', path, user='copy', stdout=StringIO(), stderr=StringIO())
+
+        def strip_ids(document):
+            return {k: [{**e, 'id': None} for e in v] if k in SECTION_NAMES else v for k, v in document.items()}
+
+        copies = Resume.objects.filter(user__username='copy').order_by('id')
+        self.assertEqual(
+            [strip_ids(r.to_document()) for r in copies],
+            [strip_ids(r.to_document()) for r in self.resumes],
+        )
+
+    def test_queries_do_not_grow_with_resumes(self):
+        with CaptureQueriesContext(connection) as few:
+            self.export(output=os.path.join(self.dir.name, 'a.ndjson.gz'))
+        for _ in range(5):
+            benchmarks.build_resume(self.user)
+        with CaptureQueriesContext(connection) as more:
+            self.export(output=os.path.join(self.dir.name, 'b.ndjson.gz'))
+        self.assertEqual(len(few), len(more))
+
+    def test_pdfs_into_sharded_directory_and_tar(self):
+        pdf_dir = os.path.join(self.dir.name, 'pdfs')
+        report = self.export(output=os.path.join(self.dir.name, 'x.ndjson'), pdf_dir=pdf_dir, chunk_size=2)
+        self.assertIn('3 PDFs', report)
+        for resume in self.resumes:
+            with open(os.path.join(pdf_dir, export_resumes.pdf_path(resume.id)), 'rb') as f:
+                self.assertTrue(f.read().startswith(b'%PDF'))
+
+        tar_path = os.path.join(self.dir.name, 'pdfs.tar')
+        self.export(output=os.path.join(self.dir.name, 'y.ndjson'), pdf_tar=tar_path)
+        with tarfile.open(tar_path) as tar:
+            self.assertEqual(sorted(tar.getnames()), sorted(export_resumes.pdf_path(r.id) for r in self.resumes))
+
+    def test_pdfs_leave_the_cache_alone(self):
+        cache = get_pdf_cache()
+        keys = [content_key(resume.to_document()) for resume in self.resumes]
+        cache.disk.set(keys[0], b'%PDF cached')
+        os.utime(cache.disk.path(keys[0]), (1, 1))
+
+        pdf_dir = os.path.join(self.dir.name, 'pdfs')
+        self.export(output=os.path.join(self.dir.name, 'x.ndjson'), pdf_dir=pdf_dir)
+        with open(os.path.join(pdf_dir, export_resumes.pdf_path(self.resumes[0].id)), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF cached')
+        # The hit did not count as use, and nothing was added.
+        self.assertEqual(os.stat(cache.disk.path(keys[0])).st_mtime, 1)
+        self.assertEqual([cache.disk.get(key) is not None for key in keys], [True, False, False])
+        self.assertEqual([cache.memory.get(key) for key in keys], [None, None, None])
+
+
+class PDFCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cache', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=1, education=1, skills=1)
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def key(self):
+        return content_key(Resume.objects.get(id=self.resume.id).to_document())
+
+    def test_key_changes_with_every_section(self):
+        posts = [
+            ('add_education', {'degree': 'MSc', 'institution': 'ETH', 'start_date': '2015-09-01'}),
+            ('add_experience', {'job_title': 'CTO', 'company': 'Initech', 'start_date': '2020-01-01', 'description': 'Ran it'}),
+            ('add_skill', {'name': 'Erlang', 'proficiency': 'Beginner'}),
+        ]
+        keys = [self.key()]
+        for view, data in posts:
+            self.client.post(reverse(view, args=[self.resume.id]), data)
+            keys.append(self.key())
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        by_items = MemoryTier(max_items=2, max_bytes=1000)
+        by_items.set('a', b'1')
+        by_items.set('b', b'2')
+        by_items.get('a')
+        by_items.set('c', b'3')
+        self.assertIsNone(by_items.get('b'))
+        self.assertEqual(by_items.get('a'), b'1')
+
+        by_bytes = MemoryTier(max_items=10, max_bytes=10)
+        by_bytes.set('a', b'x' * 4)
+        by_bytes.set('b', b'x' * 4)
+        by_bytes.set('c', b'x' * 4)
+        self.assertIsNone(by_bytes.get('a'))
+        self.assertEqual(by_bytes._size, 8)
+        by_bytes.set('huge', b'x' * 11)
+        self.assertIsNone(by_bytes.get('huge'))
+
+    def test_disk_tier_trims_oldest_files_to_target(self):
+        disk = DiskTier(self.dir.name, max_bytes=1000)
+        for i in range(5):
+            key = f'{i:02d}' + 'k' * 62
+            disk.set(key, b'x' * 200)
+            os.utime(disk.path(key), (i, i))
+        disk.set('ff' + 'k' * 62, b'x' * 200)
+        remaining = sorted(os.path.basename(path) for _, _, path in disk._files())
+        self.assertLessEqual(disk._scan_size(), 900)
+        # The oldest went first; the newest stayed.
+        self.assertNotIn('00' + 'k' * 62 + '.pdf', remaining)
+        self.assertIn('ff' + 'k' * 62 + '.pdf', remaining)
+
+    def test_disk_tier_limit_holds_across_workers(self):
+        # One tier per worker process, all on the same directory.
+        workers = [DiskTier(self.dir.name, max_bytes=100_000) for _ in range(5)]
+        peak = 0
+        for i in range(200):
+            workers[i % len(workers)].set(f'{i:064x}', b'x' * 10_000)
+            peak = max(peak, workers[0]._scan_size())
+        self.assertLessEqual(peak, 100_000)
+
+        def write(disk, start):
+            for i in range(start, start + 40):
+                disk.set(f'{i:064x}', b'y' * 10_000)
+
+        threads = [threading.Thread(target=write, args=(disk, 1000 * n)) for n, disk in enumerate(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(workers[0]._scan_size(), 100_000)
+
+
+class PDFStreamingTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('streaming', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=3, education=1, skills=5)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+        self.document = self.resume.to_document()
+        self.key = content_key(self.document)
+
+    def test_file_response_sets_content_length(self):
+        response = self.client.get(reverse('download_resume', args=[self.resume.id]))
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        self.assertTrue(body.startswith(b'%PDF'))
+        self.assertEqual(int(response['Content-Length']), len(body))
+
+    @override_settings(PDF_SPOOL_MAX_MEMORY=512)
+    def test_large_pdfs_spill_to_disk_and_skip_memory_tier(self):
+        with open_or_render(self.document) as f:
+            self.assertTrue(f._rolled)
+            self.assertTrue(f.read().startswith(b'%PDF'))
+        cache = get_pdf_cache()
+        self.assertIsNone(cache.memory.get(self.key))
+        self.assertIsNotNone(cache.disk.get(self.key))
+
+    @override_settings(PDF_SPOOL_MAX_MEMORY=10 * 1024 * 1024)
+    def test_small_pdfs_stay_in_memory_and_enter_memory_tier(self):
+        with open_or_render(self.document) as f:
+            self.assertFalse(f._rolled)
+            data = f.read()
+        self.assertEqual(get_pdf_cache().memory.get(self.key), data)
+        # The next request is served from the cache.
+        with open_or_render(self.document) as f:
+            self.assertEqual(f.read(), data)
+
+    @override_settings(PDF_STREAMING=False)
+    def test_non_streaming_fallback(self):
+        response = self.client.get(reverse('download_resume', args=[self.resume.id]))
+        self.assertFalse(response.streaming)
+        self.assertTrue(response.content.startswith(b'%PDF'))
+        self.assertIn('attachment', response['Content-Disposition'])
+
+
+def legacy_wrap(words, font_name, font_size, max_width, separator=' '):
+    """The wrap loop pdf.py used before resumes/layout.py, measuring the whole line per word."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    lines, current_line = [], []
+    for word in words:
+        current_line.append(word)
+        if stringWidth(separator.join(current_line), font_name, font_size) > max_width:
+            current_line.pop()
+            lines.append(separator.join(current_line))
+            current_line = [word]
+    if current_line:
+        lines.append(separator.join(current_line))
+    return lines
+
+
+class TextLayoutTests(SimpleTestCase):
+    def setUp(self):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from .layout import get_metrics
+
+        self.stringWidth = stringWidth
+        self.metrics = get_metrics('Helvetica', 10)
+        rng = __import__('random').Random(3)
+        vocabulary = benchmarks._WORDS + ['Zoë', 'façade', '€100', 'Łódź', 'naïve', 'WWWWW', 'i']
+        self.words = [rng.choice(vocabulary) for _ in range(400)]
+
+    def test_width_matches_string_width(self):
+        for text in ['', 'Hello, World', 'WWW iii', 'Zoë ran a façade for €100 in Łódź', ' '.join(self.words)]:
+            for font_name, size in (('Helvetica', 10), ('Helvetica-Bold', 14)):
+                from .layout import get_metrics
+                self.assertAlmostEqual(get_metrics(font_name, size).width(text), self.stringWidth(text, font_name, size), places=9)
+
+    def test_wrap_matches_the_greedy_loop_it_replaced(self):
+        for max_width in (60, 150, 480):
+            for separator in (' ', ', '):
+                self.assertEqual(
+                    self.metrics.wrap_words(self.words, max_width, separator),
+                    legacy_wrap(self.words, 'Helvetica', 10, max_width, separator),
+                )
+
+    def test_oversized_word_gets_its_own_line(self):
+        words = ['Supercalifragilisticexpialidocious', 'short', 'Supercalifragilisticexpialidocious', 'a', 'b']
+        wrapped = self.metrics.wrap_words(words, 50)
+        self.assertEqual(wrapped, ['Supercalifragilisticexpialidocious', 'short', 'Supercalifragilisticexpialidocious', 'a b'])
+        # The old loop emitted an empty line before an oversized word at the
+        # start of a line (hence the LAYOUT_VERSION bump); otherwise the same.
+        legacy = legacy_wrap(words, 'Helvetica', 10, 50)
+        self.assertIn('', legacy)
+        self.assertEqual([line for line in legacy if line], wrapped)
+
+
+class BulkDownloadTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('bulk', password='secret')
+        # Same full name, so the archive needs de-duplicated filenames.
+        cls.resumes = [benchmarks.build_resume(cls.user, experience=2, education=1, skills=3) for _ in range(3)]
+        other = User.objects.create_user('bulk-other', password='secret')
+        benchmarks.build_resume(other)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+
+    def test_zip_holds_every_resume_of_the_user(self):
+        response = self.client.get(reverse('download_all_resumes'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn('My_Resumes.zip', response['Content-Disposition'])
+
+        with zipfile.ZipFile(BytesIO(b''.join(response.streaming_content))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(sorted(archive.namelist()), [
+                'Benchmark_Candidate_Resume.pdf',
+                'Benchmark_Candidate_Resume_2.pdf',
+                'Benchmark_Candidate_Resume_3.pdf',
+            ])
+            for info in archive.infolist():
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+                self.assertTrue(archive.read(info).startswith(b'%PDF'))
+
+        # Rendered in the pool and cached for the next download.
+        cache = get_pdf_cache()
+        for resume in self.resumes:
+            self.assertIsNotNone(cache.get(content_key(resume.to_document())))
+
+    def test_iter_zip_streams_each_file_as_it_arrives(self):
+        consumed = []
+
+        def files():
+            for name in ('a.pdf', 'b.pdf'):
+                consumed.append(name)
+                yield name, name.encode() * 1000
+
+        chunks = iter_zip(files())
+        first = next(chunks)
+        # The first entry is written before the second file is asked for.
+        self.assertEqual(consumed, ['a.pdf'])
+        self.assertIn(b'a.pdf', first)
+        data = first + b''.join(chunks)
+
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ['a.pdf', 'b.pdf'])
+            self.assertEqual(archive.read('b.pdf'), b'b.pdf' * 1000)
+
+    def test_iter_zip_of_nothing_is_an_empty_archive(self):
+        with zipfile.ZipFile(BytesIO(b''.join(iter_zip([])))) as archive:
+            self.assertEqual(archive.namelist(), [])
+
+
+class RenderQueueTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('queue', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user, experience=2, education=1, skills=3)
+
+    def setUp(self):
+        super().setUp()
+        warm_login(self.client, self.user)
+        self.json_accept = {'HTTP_ACCEPT': 'application/json'}
+
+    def job(self, **fields):
+        return RenderJob.objects.create(resume=self.resume, **fields)
+
+    def test_claim_skips_jobs_another_worker_claimed_first(self):
+        first, second = self.job(), self.job()
+        filter_ = RenderJob.objects.filter
+
+        def racing_filter(*args, **kwargs):
+            if kwargs.get('id') == first.id and kwargs.get('status') == RenderJob.PENDING:
+                # Another worker claims it between our SELECT and UPDATE.
+                filter_(id=first.id).update(status=RenderJob.RUNNING, started_at=timezone.now())
+            return filter_(*args, **kwargs)
+
+        with mock.patch.object(RenderJob.objects, 'filter', side_effect=racing_filter):
+            claimed = render_queue.claim_jobs(5)
+        self.assertEqual([job.id for job in claimed], [second.id])
+        self.assertEqual(claimed[0].status, RenderJob.RUNNING)
+
+    def test_claim_respects_limit_and_run_after(self):
+        later = self.job(run_after=timezone.now() + timedelta(minutes=5))
+        jobs = [self.job() for _ in range(3)]
+        self.assertEqual([job.id for job in render_queue.claim_jobs(2)], [jobs[0].id, jobs[1].id])
+        self.assertEqual([job.id for job in render_queue.claim_jobs(5)], [jobs[2].id])
+        self.assertEqual(render_queue.claim_jobs(5), [])
+        later.refresh_from_db()
+        self.assertEqual(later.status, RenderJob.PENDING)
+
+    def test_enqueue_reuses_waiting_jobs_only(self):
+        waiting = self.job(run_after=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(render_queue.enqueue_render(self.resume).id, waiting.id)
+        waiting.refresh_from_db()
+        self.assertLessEqual(waiting.run_after, timezone.now())
+
+        # A running job may be rendering the resume as it was before an edit.
+        RenderJob.objects.filter(id=waiting.id).update(status=RenderJob.RUNNING, started_at=timezone.now())
+        job = render_queue.enqueue_render(self.resume)
+        self.assertNotEqual(job.id, waiting.id)
+        self.assertEqual(job.status, RenderJob.PENDING)
+        self.assertEqual(render_queue.enqueue_render(self.resume).id, job.id)
+
+    def test_requeue_stale_jobs(self):
+        stale = self.job(status=RenderJob.RUNNING, started_at=timezone.now() - timedelta(hours=1))
+        recent = self.job(status=RenderJob.RUNNING, started_at=timezone.now())
+        self.assertEqual(render_queue.requeue_stale_jobs(600), 1)
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual((stale.status, stale.started_at), (RenderJob.PENDING, None))
+        self.assertEqual(recent.status, RenderJob.RUNNING)
+
+    def test_prune_deletes_only_old_finished_jobs(self):
+        old = timezone.now() - timedelta(days=8)
+        self.job(status=RenderJob.DONE, finished_at=old)
+        self.job(status=RenderJob.FAILED, finished_at=old)
+        kept = [
+            self.job(status=RenderJob.DONE, finished_at=timezone.now()),
+            self.job(status=RenderJob.RUNNING, started_at=old),
+            self.job(),
+        ]
+        self.assertEqual(render_queue.prune_jobs(7 * 24 * 3600), 2)
+        self.assertQuerySetEqual(RenderJob.objects.order_by('id'), kept)
+
+    def test_render_worker_once_renders_due_jobs_and_prunes(self):
+        due = self.job()
+        waiting = self.job(run_after=timezone.now() + timedelta(minutes=5))
+        self.job(status=RenderJob.DONE, finished_at=timezone.now() - timedelta(days=30))
+        out = StringIO()
+        call_command('render_worker', '--once', '--concurrency', '1', stdout=out)
+
+        due.refresh_from_db()
+        self.assertEqual(due.status, RenderJob.DONE)
+        self.assertEqual(due.content_key, content_key(self.resume.to_document()))
+        self.assertTrue(get_pdf_cache().disk.get(due.content_key).startswith(b'%PDF'))
+        self.assertEqual(RenderJob.objects.get(id=waiting.id).status, RenderJob.PENDING)
+        self.assertEqual(RenderJob.objects.count(), 2)
+        self.assertIn(f'Rendered job {due.id}', out.getvalue())
+        self.assertIn('Deleted 1 finished render jobs', out.getvalue())
+
+    def test_status_json(self):
+        job = self.job()
+        url = reverse('render_job_status', args=[job.id])
+        self.assertEqual(self.client.get(url, **self.json_accept).json(), {'id': job.id, 'status': 'pending'})
+
+        RenderJob.objects.filter(id=job.id).update(status=RenderJob.DONE, content_key='x' * 64)
+        self.assertEqual(self.client.get(url, **self.json_accept).json()['download_url'], url)
+
+        RenderJob.objects.filter(id=job.id).update(status=RenderJob.FAILED, error='Traceback ...')
+        data = self.client.get(url, **self.json_accept).json()
+        self.assertEqual(data, {'id': job.id, 'status': 'failed', 'error': 'PDF generation failed'})
+
+    def test_status_page(self):
+        job = self.job()
+        url = reverse('render_job_status', args=[job.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Refresh'], '2')
+
+        call_command('render_worker', '--once', stdout=StringIO())
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+        # Evicted before it was fetched: queued again.
+        RenderJob.objects.filter(id=job.id).update(content_key='0' * 64)
+        response = self.client.get(url)
+        new_job = RenderJob.objects.get(status=RenderJob.PENDING)
+        self.assertRedirects(response, reverse('render_job_status', args=[new_job.id]), target_status_code=202)
+
+        RenderJob.objects.filter(id=job.id).update(status=RenderJob.FAILED)
+        response = self.client.get(url)
+        self.assertRedirects(response, reverse('edit_resume', args=[self.resume.id]), fetch_redirect_response=False)
+
+    def test_other_users_jobs_are_not_found(self):
+        other = User.objects.create_user('queue-other', password='secret')
+        job = RenderJob.objects.create(resume=benchmarks.build_resume(other))
+        self.assertEqual(self.client.get(reverse('render_job_status', args=[job.id])).status_code, 404)
+
+
+@override_settings(PDF_PRERENDER_ON_SAVE=True, PDF_PRERENDER_DELAY=5)
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('prerender', password='secret')
+        cls.resume = benchmarks.build_resume(cls.user)
+
+    def setUp(self):
+        warm_login(self.client, self.user)
+        RenderJob.objects.all().delete()
+
+    def test_burst_of_edits_coalesces_into_one_delayed_job(self):
+        job_ids = set()
+        for name in ('Rust', 'Go', 'Zig'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('add_skill', args=[self.resume.id]), {'name': name, 'proficiency': 'Expert'})
+            job = RenderJob.objects.get()
+            job_ids.add(job.id)
+            self.assertEqual(job.status, RenderJob.PENDING)
+            # Each edit pushes the render back by the full delay.
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=4))
+            self.assertEqual(render_queue.claim_jobs(5), [])
+            # As if the delay had nearly passed before the next edit.
+            RenderJob.objects.filter(id=job.id).update(run_after=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(len(job_ids), 1)
+
+    def test_nothing_is_queued_when_disabled(self):
+        with self.settings(PDF_PRERENDER_ON_SAVE=False), self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('add_skill', args=[self.resume.id]), {'name': 'Rust', 'proficiency': 'Expert'})
+        self.assertFalse(RenderJob.objects.exists())
+
+
+class AsyncURLConf:
+    """The project URLconf with ``ASYNC_VIEWS`` on."""
+
+    from resume_builder.urls import urlpatterns as _project
+    urlpatterns = [
+        path('dashboard/', async_views.dashboard, name='dashboard'),
+        path('edit/<int:resume_id>/', async_views.edit_resume, name='edit_resume'),
+        path('download/<int:resume_id>/', async_views.download_resume, name='download_resume'),
+        *_project,
+    ]
+
+
+@override_settings(ROOT_URLCONF=AsyncURLConf, DASHBOARD_PAGE_SIZE=2)
+class AsyncViewTests(TempPDFCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('async', password='secret')
+        cls.resumes = [benchmarks.build_resume(cls.user, experience=2, education=1, skills=3) for _ in range(3)]
+        Resume.objects.filter(id=cls.resumes[0].id).update(full_name='Zebra Keeper')
+        cls.other = benchmarks.build_resume(User.objects.create_user('async-other', password='secret'))
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.async_client.force_login(self.user)
+
+    async def test_dashboard_pages(self):
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        first_page = response.context['resumes']
+        self.assertEqual(len(first_page), 2)
+        cursor = response.context['next_cursor']
+        self.assertTrue(cursor)
+
+        response = await self.async_client.get(reverse('dashboard'), {'cursor': cursor})
+        rest = response.context['resumes']
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertEqual(
+            sorted(resume.id for resume in [*first_page, *rest]),
+            sorted(resume.id for resume in self.resumes),
+        )
+
+    async def test_dashboard_search(self):
+        response = await self.async_client.get(reverse('dashboard'), {'q': 'zebra'})
+        self.assertEqual([resume.id for resume in response.context['resumes']], [self.resumes[0].id])
+
+    async def test_edit_get_revalidates(self):
+        url = reverse('edit_resume', args=[self.resumes[1].id])
+        await self.async_client.get(url)  # sets the CSRF cookie the ETag covers
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Benchmark Candidate')
+        etag = response['ETag']
+
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_edit_post_saves(self):
+        resume = self.resumes[1]
+        url = reverse('edit_resume', args=[resume.id])
+        data = {
+            'full_name': 'Renamed Candidate', 'email': 'renamed@example.com',
+            'phone': resume.phone, 'address': resume.address, 'summary': resume.summary,
+        }
+        response = await self.async_client.post(url, data)
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        updated = await Resume.objects.aget(id=resume.id)
+        self.assertEqual((updated.full_name, updated.email), ('Renamed Candidate', 'renamed@example.com'))
+
+    async def test_download_and_not_modified(self):
+        url = reverse('download_resume', args=[self.resumes[2].id])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        body = b''.join(response.streaming_content)
+        self.assertTrue(body.startswith(b'%PDF'))
+
+        response = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_other_users_resumes_are_not_found(self):
+        for name in ('edit_resume', 'download_resume'):
+            response = await self.async_client.get(reverse(name, args=[self.other.id]))
+            self.assertEqual(response.status_code, 404)
@@ -1,17 +1,32 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    from . import async_views
+    dashboard_view = async_views.dashboard
+    edit_resume_view = async_views.edit_resume
+    download_resume_view = async_views.download_resume
+else:
+    dashboard_view = views.dashboard
+    edit_resume_view = views.edit_resume
+    download_resume_view = views.download_resume
+
 urlpatterns = [
     path('', views.home, name='home'),
     path('signup/', views.signup, name='signup'),
     path('login/', views.user_login, name='login'),
     path('logout/', views.user_logout, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', dashboard_view, name='dashboard'),
     path('create/', views.create_resume, name='create_resume'),
-    path('edit/<int:resume_id>/', views.edit_resume, name='edit_resume'),
-    path('download/<int:resume_id>/', views.download_resume, name='download_resume'),
+    path('edit/<int:resume_id>/', edit_resume_view, name='edit_resume'),
+    path('download/<int:resume_id>/', download_resume_view, name='download_resume'),
+    path('render-job/<int:job_id>/', views.render_job_status, name='render_job_status'),
+    path('download-all/', views.download_all_resumes, name='download_all_resumes'),
     path('delete/<int:resume_id>/', views.delete_resume, name='delete_resume'),
     path('add-education/<int:resume_id>/', views.add_education, name='add_education'),
     path('add-experience/<int:resume_id>/', views.add_experience, name='add_experience'),
     path('add-skill/<int:resume_id>/', views.add_skill, name='add_skill'),
+    path('batch-add/<int:resume_id>/', views.batch_add, name='batch_add'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,20 +1,35 @@
+import json
+import mimetypes
+import os
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.db import transaction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.http import Http404, HttpResponse, FileResponse, StreamingHttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers, add_never_cache_headers, get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import condition
 
 from .forms import SignUpForm, ResumeForm, EducationForm, ExperienceForm, SkillForm
-from .models import Resume, Education, Experience, Skill
-
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph, Frame
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from io import BytesIO
+from .forms import EducationFormSet, ExperienceFormSet, SkillFormSet
+from .models import Resume, Education, Experience, Skill, RenderJob
+from .pdf_cache import get_or_render, open_or_render, content_key, get_pdf_cache
+from .render_queue import enqueue_render
+from .signals import schedule_prerender
+from .bulk import render_many, iter_zip, unique_filenames
+from .pagination import keyset_page
+from .search import search_resumes
+from .metrics import collect, get_store, to_prometheus
+from .storage import COMPRESSIBLE_EXTENSIONS, WEBP_EXTENSIONS
+from .conditional import get_resume, pdf_etag, pdf_last_modified, edit_page_etag
 
 
 def home(request):
@@ -62,8 +77,24 @@ def user_logout(request):
 
 @login_required
 def dashboard(request):
-    resumes = Resume.objects.filter(user=request.user)
-    return render(request, 'resumes/dashboard.html', {'resumes': resumes})
+    query = request.GET.get('q', '').strip()
+    if query:
+        # Search results come best match first, one page only.
+        resumes = search_resumes(query, Resume.objects.for_dashboard(request.user), settings.DASHBOARD_PAGE_SIZE)
+        next_cursor = None
+    else:
+        resumes, next_cursor = keyset_page(
+            Resume.objects.for_dashboard(request.user),
+            request.GET.get('cursor', ''),
+            settings.DASHBOARD_PAGE_SIZE,
+        )
+    context = {
+        'resumes': resumes,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+        'query': query,
+    }
+    return render(request, 'resumes/dashboard.html', context)
 
 @login_required
 def create_resume(request):
@@ -81,8 +112,11 @@ def create_resume(request):
     return render(request, 'resumes/create_resume.html', {'form': form})
 
 @login_required
+@condition(etag_func=edit_page_etag)
 def edit_resume(request, resume_id):
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    resume = get_resume(request, resume_id)
+    if resume is None:
+        raise Http404('No Resume matches the given query.')
     
     if request.method == 'POST':
         form = ResumeForm(request.POST, instance=resume)
@@ -100,7 +134,9 @@ def edit_resume(request, resume_id):
         'experience_form': ExperienceForm(),
         'skill_form': SkillForm(),
     }
-    return render(request, 'resumes/edit_resume.html', context)
+    response = render(request, 'resumes/edit_resume.html', context)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 @login_required
 def add_education(request, resume_id):
@@ -109,9 +145,11 @@ def add_education(request, resume_id):
     if request.method == 'POST':
         form = EducationForm(request.POST)
         if form.is_valid():
-            education = form.save(commit=False)
-            education.resume = resume  # Link to this resume
-            education.save()
+            with transaction.atomic():
+                education = form.save(commit=False)
+                education.resume = resume  # Link to this resume
+                education.save()
+                resume.refresh_snapshot()
             messages.success(request, 'Education added!')
     
     return redirect('edit_resume', resume_id=resume.id)
@@ -123,9 +161,11 @@ def add_experience(request, resume_id):
     if request.method == 'POST':
         form = ExperienceForm(request.POST)
         if form.is_valid():
-            experience = form.save(commit=False)
-            experience.resume = resume
-            experience.save()
+            with transaction.atomic():
+                experience = form.save(commit=False)
+                experience.resume = resume
+                experience.save()
+                resume.refresh_snapshot()
             messages.success(request, 'Experience added!')
     
     return redirect('edit_resume', resume_id=resume.id)
@@ -137,293 +177,191 @@ def add_skill(request, resume_id):
     if request.method == 'POST':
         form = SkillForm(request.POST)
         if form.is_valid():
-            skill = form.save(commit=False)
-            skill.resume = resume
-            skill.save()
+            with transaction.atomic():
+                skill = form.save(commit=False)
+                skill.resume = resume
+                skill.save()
+                resume.refresh_snapshot()
             messages.success(request, 'Skill added!')
     
     return redirect('edit_resume', resume_id=resume.id)
 
+BATCH_SECTIONS = (
+    ('education', EducationFormSet, Education),
+    ('experience', ExperienceFormSet, Experience),
+    ('skills', SkillFormSet, Skill),
+)
+
+def _batch_json_to_formset_data(payload):
+    """Turn {"skills": [{...}, ...], ...} into the POST data the formsets expect."""
+    data = {}
+    for prefix, _, _ in BATCH_SECTIONS:
+        entries = payload.get(prefix) or []
+        if not isinstance(entries, list):
+            raise ValueError(prefix)
+        data[f'{prefix}-TOTAL_FORMS'] = str(len(entries))
+        data[f'{prefix}-INITIAL_FORMS'] = '0'
+        for index, entry in enumerate(entries):
+            for field, value in entry.items():
+                data[f'{prefix}-{index}-{field}'] = '' if value is None else value
+    return data
+
 @login_required
-def download_resume(request, resume_id):
+def batch_add(request, resume_id):
     """
-    Generate a professional PDF resume
+    Add many education, experience and skill entries at once, either from the
+    formsets on the batch page or from a JSON body such as
+    {"skills": [{"name": "Python", "proficiency": "Expert"}, ...]}.
+    Everything is validated first, then inserted with one bulk_create per
+    section in a single transaction.
     """
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    is_json = request.content_type == 'application/json'
     
-    # Create PDF in memory
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    
-    # Define colors
-    primary_color = colors.HexColor('#2c3e50')
-    accent_color = colors.HexColor('#00d9ff')
-    text_color = colors.HexColor('#4a5568')
+    if request.method == 'POST':
+        if is_json:
+            try:
+                data = _batch_json_to_formset_data(json.loads(request.body))
+            except (ValueError, AttributeError, TypeError):
+                return JsonResponse({'error': 'Expected a JSON object of entry lists.'}, status=400)
+        else:
+            data = request.POST
+        
+        formsets = {prefix: formset_class(data, prefix=prefix) for prefix, formset_class, _ in BATCH_SECTIONS}
+        valid = [formset.is_valid() for formset in formsets.values()]
+        if all(valid):
+            created = {}
+            with transaction.atomic():
+                for prefix, _, model in BATCH_SECTIONS:
+                    entries = []
+                    for form in formsets[prefix]:
+                        if form.has_changed():  # skip blank extra rows
+                            entry = form.save(commit=False)
+                            entry.resume = resume
+                            entries.append(entry)
+                    model.objects.bulk_create(entries)
+                    created[prefix] = len(entries)
+                resume.refresh_snapshot()
+                # bulk_create sends no post_save signals
+                schedule_prerender(resume.id)
+            
+            if is_json:
+                return JsonResponse({'created': created, 'snapshot_version': resume.snapshot_version}, status=201)
+            messages.success(request, f'Added {sum(created.values())} entries!')
+            return redirect('edit_resume', resume_id=resume.id)
+        
+        if is_json:
+            errors = {
+                prefix: {
+                    'entries': [form.errors.get_json_data() for form in formset],
+                    'non_field_errors': formset.non_form_errors().get_json_data(),
+                }
+                for prefix, formset in formsets.items()
+            }
+            return JsonResponse({'errors': errors}, status=400)
+    else:
+        formsets = {prefix: formset_class(prefix=prefix) for prefix, formset_class, _ in BATCH_SECTIONS}
     
-    y = height - 50  # Start position from top
+    return render(request, 'resumes/batch_add.html', {'resume': resume, 'formsets': formsets})
+
+def _pdf_response(pdf, filename):
+    # FileResponse streams the file in chunks, sets Content-Length and
+    # closes it once the client has the whole PDF.
+    response = FileResponse(pdf, as_attachment=True, filename=filename, content_type='application/pdf')
+    # Per-user content: browsers may keep it but must revalidate (ETag).
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+@login_required
+@condition(etag_func=pdf_etag, last_modified_func=pdf_last_modified)
+def download_resume(request, resume_id):
+    """
+    Generate a professional PDF resume
+    """
+    resume = get_resume(request, resume_id)
+    if resume is None:
+        raise Http404('No Resume matches the given query.')
     
-    # ==================== HEADER SECTION ====================
-    # Name
-    p.setFont("Helvetica-Bold", 28)
-    p.setFillColor(primary_color)
-    p.drawCentredString(width/2, y, resume.full_name.upper())
+    document = resume.to_document()
+    filename = resume.pdf_filename()
     
-    # Contact Information
-    y -= 25
-    p.setFont("Helvetica", 11)
-    p.setFillColor(text_color)
-    contact_line = f"{resume.email}  •  {resume.phone}  •  {resume.address}"
-    p.drawCentredString(width/2, y, contact_line)
+    if settings.PDF_ASYNC_RENDERING:
+        # Serve a ready PDF, otherwise leave the render to the queue worker
+        pdf = get_pdf_cache().open(content_key(document))
+        if pdf is None:
+            job = enqueue_render(resume)
+            response = redirect('render_job_status', job_id=job.id)
+            # Carries the PDF's ETag; must not be revalidated in its place.
+            add_never_cache_headers(response)
+            return response
+        return _pdf_response(pdf, filename)
     
-    # Horizontal line under header
-    y -= 15
-    p.setStrokeColor(accent_color)
-    p.setLineWidth(2)
-    p.line(50, y, width-50, y)
+    if settings.PDF_STREAMING:
+        return _pdf_response(open_or_render(document), filename)
     
-    y -= 35
+    pdf = get_or_render(document)
     
-    # ==================== PROFESSIONAL SUMMARY ====================
-    if resume.summary:
-        p.setFont("Helvetica-Bold", 14)
-        p.setFillColor(accent_color)
-        p.drawString(50, y, "PROFESSIONAL SUMMARY")
-        
-        y -= 5
-        p.setStrokeColor(accent_color)
-        p.setLineWidth(1)
-        p.line(50, y, 235, y)
-        
-        y -= 20
-        p.setFont("Helvetica", 10)
-        p.setFillColor(text_color)
-        
-        # Word wrap for summary
-        max_width = width - 100
-        words = resume.summary.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            test_line = ' '.join(current_line)
-            if p.stringWidth(test_line, "Helvetica", 10) > max_width:
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        for line in lines:
-            p.drawString(50, y, line)
-            y -= 15
-        
-        y -= 10
+    # Create HTTP response
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    patch_cache_control(response, private=True, no_cache=True)
     
-    # ==================== WORK EXPERIENCE ====================
-    if resume.experience.exists():
-        if y < 150:
-            p.showPage()
-            y = height - 50
-        
-        p.setFont("Helvetica-Bold", 14)
-        p.setFillColor(accent_color)
-        p.drawString(50, y, "WORK EXPERIENCE")
-        
-        y -= 5
-        p.setStrokeColor(accent_color)
-        p.setLineWidth(1)
-        p.line(50, y, 190, y)
-        
-        y -= 25
-        
-        for exp in resume.experience.all():
-            if y < 100:
-                p.showPage()
-                y = height - 50
-            
-            # Job Title
-            p.setFont("Helvetica-Bold", 12)
-            p.setFillColor(primary_color)
-            p.drawString(50, y, exp.job_title)
-            
-            # Date (right aligned)
-            p.setFont("Helvetica", 10)
-            p.setFillColor(text_color)
-            date_str = f"{exp.start_date.strftime('%b %Y')} - {exp.end_date.strftime('%b %Y') if exp.end_date else 'Present'}"
-            date_width = p.stringWidth(date_str, "Helvetica", 10)
-            p.drawString(width - 50 - date_width, y, date_str)
-            
-            y -= 15
-            
-            # Company
-            p.setFont("Helvetica-Oblique", 11)
-            p.setFillColor(text_color)
-            p.drawString(50, y, exp.company)
-            
-            y -= 18
-            
-            # Description with bullet points
-            p.setFont("Helvetica", 10)
-            desc_lines = exp.description.split('\n')
-            
-            for line in desc_lines:
-                if line.strip():
-                    # Check if line starts with bullet
-                    if line.strip().startswith('•') or line.strip().startswith('-'):
-                        display_line = '  ' + line.strip()
-                    else:
-                        display_line = '  • ' + line.strip()
-                    
-                    # Word wrap if needed
-                    max_width = width - 120
-                    if p.stringWidth(display_line, "Helvetica", 10) > max_width:
-                        words = display_line.split()
-                        current_line = []
-                        for word in words:
-                            current_line.append(word)
-                            test_line = ' '.join(current_line)
-                            if p.stringWidth(test_line, "Helvetica", 10) > max_width:
-                                current_line.pop()
-                                p.drawString(60, y, ' '.join(current_line))
-                                y -= 12
-                                current_line = [word]
-                        if current_line:
-                            p.drawString(60, y, ' '.join(current_line))
-                            y -= 12
-                    else:
-                        p.drawString(60, y, display_line)
-                        y -= 12
-            
-            y -= 15
+    return response
+
+@login_required
+def render_job_status(request, job_id):
+    """
+    Poll a queued render. Returns JSON to API clients; browsers get a
+    self-refreshing page until the PDF is ready, then the PDF itself.
+    """
+    job = get_object_or_404(
+        RenderJob.objects.select_related('resume'),
+        id=job_id,
+        resume__user=request.user,
+    )
     
-    # ==================== EDUCATION ====================
-    if resume.education.exists():
-        if y < 150:
-            p.showPage()
-            y = height - 50
-        
-        p.setFont("Helvetica-Bold", 14)
-        p.setFillColor(accent_color)
-        p.drawString(50, y, "EDUCATION")
-        
-        y -= 5
-        p.setStrokeColor(accent_color)
-        p.setLineWidth(1)
-        p.line(50, y, 135, y)
-        
-        y -= 25
-        
-        for edu in resume.education.all():
-            if y < 100:
-                p.showPage()
-                y = height - 50
-            
-            # Degree
-            p.setFont("Helvetica-Bold", 12)
-            p.setFillColor(primary_color)
-            p.drawString(50, y, edu.degree)
-            
-            # Date (right aligned)
-            p.setFont("Helvetica", 10)
-            p.setFillColor(text_color)
-            date_str = f"{edu.start_date.strftime('%b %Y')} - {edu.end_date.strftime('%b %Y') if edu.end_date else 'Present'}"
-            date_width = p.stringWidth(date_str, "Helvetica", 10)
-            p.drawString(width - 50 - date_width, y, date_str)
-            
-            y -= 15
-            
-            # Institution
-            p.setFont("Helvetica-Oblique", 11)
-            p.drawString(50, y, edu.institution)
-            
-            y -= 15
-            
-            # Description if exists
-            if edu.description:
-                p.setFont("Helvetica", 10)
-                desc_lines = edu.description.split('\n')
-                for line in desc_lines[:3]:  # Limit to 3 lines
-                    if line.strip():
-                        p.drawString(60, y, line.strip()[:80])
-                        y -= 12
-            
-            y -= 15
+    if 'application/json' in request.headers.get('Accept', ''):
+        data = {'id': job.id, 'status': job.status}
+        if job.status == RenderJob.DONE:
+            data['download_url'] = reverse('render_job_status', args=[job.id])
+        elif job.status == RenderJob.FAILED:
+            data['error'] = 'PDF generation failed'
+        return JsonResponse(data)
     
-    # ==================== SKILLS ====================
-    if resume.skills.exists():
-        if y < 150:
-            p.showPage()
-            y = height - 50
-        
-        p.setFont("Helvetica-Bold", 14)
-        p.setFillColor(accent_color)
-        p.drawString(50, y, "SKILLS")
-        
-        y -= 5
-        p.setStrokeColor(accent_color)
-        p.setLineWidth(1)
-        p.line(50, y, 100, y)
-        
-        y -= 20
-        
-        # Group skills by proficiency
-        skills_by_prof = {}
-        for skill in resume.skills.all():
-            prof = skill.proficiency
-            if prof not in skills_by_prof:
-                skills_by_prof[prof] = []
-            skills_by_prof[prof].append(skill.name)
-        
-        # Display skills grouped by proficiency
-        p.setFont("Helvetica", 10)
-        p.setFillColor(text_color)
-        
-        for proficiency in ['Expert', 'Advanced', 'Intermediate', 'Beginner']:
-            if proficiency in skills_by_prof:
-                p.setFont("Helvetica-Bold", 10)
-                p.setFillColor(primary_color)
-                p.drawString(50, y, f"{proficiency}:")
-                
-                p.setFont("Helvetica", 10)
-                p.setFillColor(text_color)
-                skills_text = ', '.join(skills_by_prof[proficiency])
-                
-                # Word wrap skills
-                max_width = width - 170
-                if p.stringWidth(skills_text, "Helvetica", 10) > max_width:
-                    words = skills_text.split(', ')
-                    current_line = []
-                    x_offset = 130
-                    
-                    for word in words:
-                        current_line.append(word)
-                        test_line = ', '.join(current_line)
-                        if p.stringWidth(test_line, "Helvetica", 10) > max_width:
-                            current_line.pop()
-                            p.drawString(x_offset, y, ', '.join(current_line) + ',')
-                            y -= 12
-                            current_line = [word]
-                    if current_line:
-                        p.drawString(x_offset, y, ', '.join(current_line))
-                        y -= 15
-                else:
-                    p.drawString(130, y, skills_text)
-                    y -= 15
+    if job.status == RenderJob.DONE:
+        pdf = get_pdf_cache().open(job.content_key)
+        if pdf is None:
+            # Evicted from the cache before it was fetched; render it again.
+            job = enqueue_render(job.resume)
+            return redirect('render_job_status', job_id=job.id)
+        return FileResponse(
+            pdf,
+            as_attachment=True,
+            filename=job.resume.pdf_filename(),
+            content_type='application/pdf',
+        )
     
-    # Save PDF
-    p.showPage()
-    p.save()
+    if job.status == RenderJob.FAILED:
+        messages.error(request, 'Sorry, we could not generate your PDF. Please try again.')
+        return redirect('edit_resume', resume_id=job.resume_id)
     
-    # Get PDF from buffer
-    buffer.seek(0)
+    response = render(request, 'resumes/render_job.html', {'job': job}, status=202)
+    response['Refresh'] = '2'
+    return response
+
+@login_required
+def download_all_resumes(request):
+    """
+    Download every resume of the current user as one ZIP. PDFs are rendered
+    in parallel and each one is streamed into the archive as soon as it is done.
+    """
+    resumes = list(Resume.objects.filter(user=request.user))
+    filenames = unique_filenames([resume.pdf_filename() for resume in resumes])
+    documents = [resume.to_document() for resume in resumes]
     
-    # Create HTTP response
-    response = HttpResponse(buffer, content_type='application/pdf')
-    filename = f"{resume.full_name.replace(' ', '_')}_Resume.pdf"
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    files = ((filenames[index], pdf) for index, pdf in render_many(documents))
+    response = StreamingHttpResponse(iter_zip(files), content_type='application/zip')
+    response['Content-Disposition'] = 'attachment; filename="My_Resumes.zip"'
     
     return response
 
@@ -432,4 +370,64 @@ def delete_resume(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
     resume.delete()
     messages.success(request, 'Resume deleted successfully!')
-    return redirect('dashboard')
\ No newline at end of file
+    return redirect('dashboard')
+
+def metrics(request):
+    """Performance histograms of all worker processes, in Prometheus text format."""
+    if not (request.user.is_staff or request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS):
+        raise PermissionDenied
+    get_store().flush(force=True)
+    return HttpResponse(
+        to_prometheus(collect(settings.METRICS_DIR)),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+def static_file(request, path):
+    """
+    Serve a static file from ``STATIC_ROOT``, picking a WebP or brotli/gzip
+    variant written by ``collectstatic`` when the client accepts it. Hashed
+    names are cached for a year; anything else is revalidated.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        # Not collected yet (e.g. no collectstatic run); look in the apps
+        full_path = finders.find(path)
+        if full_path is None:
+            raise Http404
+    
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    serve_path, encoding, vary = full_path, None, None
+    extension = os.path.splitext(full_path)[1].lower()
+    if extension in WEBP_EXTENSIONS:
+        vary = 'Accept'
+        if 'image/webp' in request.headers.get('Accept', '') and os.path.isfile(full_path + '.webp'):
+            serve_path, content_type = full_path + '.webp', 'image/webp'
+    elif extension in COMPRESSIBLE_EXTENSIONS:
+        vary = 'Accept-Encoding'
+        accepted = {value.split(';')[0].strip() for value in request.headers.get('Accept-Encoding', '').split(',')}
+        for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if name in accepted and os.path.isfile(full_path + suffix):
+                serve_path, encoding = full_path + suffix, name
+                break
+    
+    immutable = path in getattr(staticfiles_storage, 'hashed_names', ())
+    if not immutable:
+        last_modified = int(os.stat(serve_path).st_mtime)
+        response = get_conditional_response(request, last_modified=last_modified)
+        if response is not None:
+            return response
+    
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if vary:
+        patch_vary_headers(response, [vary])
+    if immutable:
+        patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    else:
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, no_cache=True)
+    return response